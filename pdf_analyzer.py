@@ -27,15 +27,19 @@ Nota:
 
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Importar módulos refactorizados
-from src.pdf.extractor import PDFExtractor
-from src.checkers.languagetool import LanguageToolChecker
+from src.pdf import create_extractor, iter_pages_parallel
+from src.checkers.languagetool import LanguageToolChecker, LanguageToolPool
 from src.checkers.ollama import OllamaChecker
-from src.formatters import format_output_hybrid
+from src.checkers.ollama_pool import parse_hosts
+from src.checkers.cache import create_languagetool_cache, create_prompt_cache
+from src.formatters import HybridReportWriter
+from src.pipeline import PageExtractionError, run_pipeline
 from src.config import settings
-from src.utils import get_windows_host_ip, verify_ollama_connection, create_debug_directory, save_page_text_debug
+from src.utils import get_windows_host_ip, verify_ollama_connection, create_debug_directory, timed_iter
 
 try:
     from tqdm import tqdm
@@ -66,17 +70,37 @@ def main():
     parser.add_argument('--start-page', type=int, default=None, help='Página de inicio')
     parser.add_argument('--end-page', type=int, default=None, help='Página final')
     parser.add_argument('--debug', action='store_true', help='Modo debug: guarda texto extraído de cada página')
+    parser.add_argument('--no-cache', action='store_true', help='Desactiva la caché persistente de resultados de LanguageTool y Ollama')
     parser.add_argument(
         '--model',
         type=str,
         default=settings.ollama_model,
         help=f'Modelo de Ollama a usar (default: {settings.ollama_model})'
     )
+    parser.add_argument(
+        '--pdf-backend',
+        type=str,
+        choices=['auto', 'pymupdf', 'pdfium', 'pdfminer'],
+        default=settings.pdf_backend,
+        help=f'Backend de extracción de texto (default: {settings.pdf_backend})'
+    )
+    parser.add_argument(
+        '--extract-workers',
+        type=int,
+        default=settings.pdf_extract_workers,
+        help=f'Procesos de extracción de texto del PDF (default: {settings.pdf_extract_workers})'
+    )
+    parser.add_argument(
+        '--lt-workers',
+        type=int,
+        default=settings.languagetool_workers,
+        help=f'Procesos de LanguageTool, cada uno con su servidor (default: {settings.languagetool_workers})'
+    )
     parser.add_argument(
         '--ollama-host',
         type=str,
         default=default_host,
-        help=f'Host de Ollama (default: auto-detectado)'
+        help=f'Host de Ollama; admite varios separados por comas (default: auto-detectado)'
     )
 
     args = parser.parse_args()
@@ -92,39 +116,102 @@ def main():
     print(f"🔧 Modo: Híbrido (LanguageTool + Ollama)")
     print()
 
-    # Inicializar LanguageTool
+    # Caché persistente de resultados de LanguageTool
+    lt_cache = None
+    if settings.cache_enabled and not args.no_cache:
+        try:
+            lt_cache = create_languagetool_cache(settings.cache_dir)
+        except Exception as e:
+            print(f"⚠️  Advertencia: Caché de LanguageTool desactivada: {str(e)}")
+
+    # Inicializar LanguageTool (con --lt-workers > 1, un servidor por proceso,
+    # salvo que se use un servidor remoto o el compartido)
+    lt_workers = max(1, args.lt_workers)
+    lt_server_port = settings.languagetool_port if settings.languagetool_shared_server else None
     print("🔧 Inicializando LanguageTool...")
-    lt_checker = LanguageToolChecker(
-        language=settings.languagetool_language,
-        cache_dir=settings.languagetool_cache_dir
+    if lt_workers > 1:
+        lt_checker = LanguageToolPool(
+            language=settings.languagetool_language,
+            cache_dir=settings.languagetool_cache_dir,
+            workers=lt_workers,
+            remote_url=settings.languagetool_remote_url,
+            shared_server_port=lt_server_port,
+            result_cache=lt_cache
+        )
+    else:
+        lt_checker = LanguageToolChecker(
+            language=settings.languagetool_language,
+            cache_dir=settings.languagetool_cache_dir,
+            remote_url=settings.languagetool_remote_url,
+            shared_server_port=lt_server_port,
+            result_cache=lt_cache
+        )
+
+    ollama_hosts = parse_hosts(args.ollama_host)
+    for ollama_host in ollama_hosts:
+        print(f"🔧 Verificando conexión a Ollama ({ollama_host})...")
+
+    # Caché persistente de respuestas de Ollama
+    prompt_cache = None
+    if settings.cache_enabled and not args.no_cache:
+        try:
+            prompt_cache = create_prompt_cache(
+                settings.cache_dir,
+                semantic=settings.ollama_semantic_cache,
+                threshold=settings.ollama_semantic_threshold
+            )
+        except Exception as e:
+            print(f"⚠️  Advertencia: Caché de Ollama desactivada: {str(e)}")
+
+    # Inicializar Ollama checker
+    ollama_checker = OllamaChecker(
+        model=args.model,
+        host=ollama_hosts,
+        timeout=settings.ollama_timeout,
+        max_concurrency=settings.ollama_max_concurrency,
+        initial_concurrency=settings.ollama_initial_concurrency,
+        cache=prompt_cache,
+        max_input_tokens=settings.ollama_max_input_tokens,
+        num_ctx=settings.ollama_num_ctx,
+        num_predict=settings.ollama_num_predict,
+        keep_alive=settings.ollama_keep_alive
     )
 
+    def prepare_ollama(ollama_host):
+        # Mismo timeout que OllamaChecker para que ambos compartan el cliente
+        client = verify_ollama_connection(ollama_host, timeout=settings.ollama_timeout)
+        if client is not None:
+            ollama_checker.warm_up(ollama_host)
+        return client
+
+    def open_pdf():
+        extractor = create_extractor(str(pdf_path), args.pdf_backend)
+        return extractor, extractor.get_page_count()
+
+    # LanguageTool, Ollama y el PDF se preparan en paralelo: se espera al más lento
+    with ThreadPoolExecutor(max_workers=2 + len(ollama_hosts)) as startup:
+        lt_future = startup.submit(lt_checker.initialize)
+        # Verificación y precarga del modelo en cada servidor de Ollama
+        ollama_futures = [startup.submit(prepare_ollama, ollama_host) for ollama_host in ollama_hosts]
+        pdf_future = startup.submit(open_pdf)
+
     try:
-        lt_checker.initialize()
+        lt_future.result()
     except Exception as e:
         print(f"❌ Error al inicializar LanguageTool: {str(e)}")
         sys.exit(1)
 
-    # Verificar Ollama
-    print(f"🔧 Verificando conexión a Ollama ({args.ollama_host})...")
-    if not verify_ollama_connection(args.ollama_host):
+    # Verificar Ollama (uno o varios servidores)
+    if any(future.result() is None for future in ollama_futures):
         lt_checker.cleanup()
         sys.exit(1)
     print(f"✅ Ollama conectado - Modelo: {args.model}")
-
-    # Inicializar Ollama checker
-    ollama_checker = OllamaChecker(
-        model=args.model,
-        host=args.ollama_host,
-        timeout=settings.ollama_timeout
-    )
-
     print()
 
     # Inicializar PDF extractor
     try:
-        pdf_extractor = PDFExtractor(str(pdf_path))
-        total_pages = pdf_extractor.get_page_count()
+        pdf_extractor, total_pages = pdf_future.result()
+        print(f"🔧 Extractor PDF: {type(pdf_extractor).__name__}")
         print(f"📖 Total de páginas: {total_pages}")
         print()
     except Exception as e:
@@ -155,76 +242,91 @@ def main():
         except Exception as e:
             print(f"⚠️  Advertencia debug: {str(e)}\n")
 
-    # Procesar páginas
-    page_errors = {}
-    total_lt_errors = 0
-    total_ollama_errors = 0
+    # Con --extract-workers > 1, la extracción se reparte en tramos entre procesos
+    if args.extract_workers > 1:
+        pages = iter_pages_parallel(
+            str(pdf_path), start_page - 1, end_page,
+            backend=args.pdf_backend,
+            workers=args.extract_workers
+        )
+    else:
+        pages = pdf_extractor.iter_pages(start_page - 1, end_page)
+
+    # En modo debug se mide el tiempo de extracción por página
+    extraction_times = []
+    if debug_dir:
+        pages = timed_iter(pages, extraction_times)
+
+    # El informe se escribe página a página, en orden, a medida que se analizan
+    try:
+        report = HybridReportWriter(args.out)
+    except Exception as e:
+        print(f"❌ Error al guardar: {str(e)}")
+        lt_checker.cleanup()
+        sys.exit(1)
 
+    # Procesar páginas (pipeline asíncrono: extracción, LanguageTool y Ollama solapados)
     print("🔍 Analizando páginas...")
     try:
-        for page_num in tqdm(range(start_page - 1, end_page), desc="Progreso", unit="pág"):
-            try:
-                text = pdf_extractor.extract_page_text(page_num)
-
-                if debug_dir:
-                    save_page_text_debug(text, page_num, debug_dir)
-
-                if text.strip():
-                    page_errors[page_num] = {}
-
-                    # LanguageTool
-                    lt_errors = lt_checker.check(text, page_num)
-                    if lt_errors:
-                        page_errors[page_num]['languagetool'] = lt_errors
-                        total_lt_errors += len(lt_errors)
-
-                    # Ollama
-                    ollama_errors = ollama_checker.check(text, page_num)
-                    if ollama_errors:
-                        page_errors[page_num]['ollama'] = ollama_errors
-                        total_ollama_errors += len(ollama_errors)
-
-                    # Remover página si no tiene errores
-                    if not page_errors[page_num]:
-                        del page_errors[page_num]
-
-            except Exception as e:
-                print(f"\n⚠️  Error en página {page_num + 1}: {str(e)}")
-                continue
+        with tqdm(total=end_page - start_page + 1, desc="Progreso", unit="pág") as pbar:
+            run_pipeline(
+                pages,
+                lt_checker,
+                ollama_checker,
+                debug_dir=debug_dir,
+                on_page_done=lambda: pbar.update(1),
+                # Suficientes consumidores para ocupar todos los servidores de Ollama
+                workers=max(settings.pipeline_workers, len(ollama_hosts) * settings.ollama_max_concurrency),
+                queue_size=settings.pipeline_queue_size,
+                lt_batch_size=settings.languagetool_batch_size,
+                lt_workers=lt_workers,
+                min_ollama_chars=settings.min_ollama_chars,
+                min_alpha_ratio=settings.min_alpha_ratio,
+                min_clean_ollama_chars=settings.min_clean_ollama_chars,
+                on_page_result=report.write_page,
+            )
+        report.close()
 
     except KeyboardInterrupt:
+        # Conservar en el informe las páginas ya terminadas
+        report.close(finished=False)
         print("\n\n⚠️  Proceso interrumpido")
+        print(f"📝 Resultado parcial guardado en: {args.out}")
         lt_checker.cleanup()
         sys.exit(1)
+    except PageExtractionError as e:
+        # Las páginas anteriores al fallo ya están en el informe
+        report.close(finished=False)
+        print(f"\n❌ {str(e)}")
+        print(f"📝 Resultado parcial guardado en: {args.out}")
+        sys.exit(1)
+    except OSError as e:
+        report.close(finished=False)
+        print(f"❌ Error al guardar: {str(e)}")
+        sys.exit(1)
     finally:
         lt_checker.cleanup()
 
     print()
 
-    # Guardar resultados
-    try:
-        output_text = format_output_hybrid(page_errors)
-
-        with open(args.out, 'w', encoding='utf-8') as f:
-            if output_text:
-                f.write(output_text)
-            else:
-                f.write("No se encontraron errores.\n")
-
-        pages_with_errors = len(page_errors)
-        print(f"✅ Análisis completado:")
-        print(f"   📝 LanguageTool: {total_lt_errors} errores")
-        print(f"   🤖 Ollama LLM: {total_ollama_errors} errores de redacción")
-        print(f"   📄 Páginas con errores: {pages_with_errors}")
-        print(f"📝 Resultado guardado en: {args.out}")
-
-        if debug_dir:
-            print(f"🐛 Debug: {debug_dir}/")
-
-    except Exception as e:
-        print(f"❌ Error al guardar: {str(e)}")
-        sys.exit(1)
-
+    print(f"✅ Análisis completado:")
+    print(f"   📝 LanguageTool: {report.total_lt_errors} errores")
+    print(f"   🤖 Ollama LLM: {report.total_ollama_errors} errores de redacción")
+    print(f"   📄 Páginas con errores: {report.pages_with_errors}")
+    if lt_cache is not None:
+        stats = lt_cache.stats
+        print(f"   💾 Caché LanguageTool: {stats['hits']} aciertos, {stats['misses']} fallos")
+    if prompt_cache is not None:
+        stats = prompt_cache.stats
+        print(f"   💾 Caché Ollama: {stats['hits']} aciertos, "
+              f"{stats['semantic_hits']} semánticos, {stats['misses']} fallos")
+    print(f"📝 Resultado guardado en: {args.out}")
+
+    if debug_dir:
+        print(f"🐛 Debug: {debug_dir}/")
+        if extraction_times:
+            mean_ms = 1000 * sum(extraction_times) / len(extraction_times)
+            print(f"⏱️  Extracción ({type(pdf_extractor).__name__}): {mean_ms:.1f} ms/página de media")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
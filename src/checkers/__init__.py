@@ -1,15 +1,25 @@
 """Módulo de verificadores de texto (LanguageTool y Ollama)."""
 
 # Importaciones lazy para evitar errores si faltan dependencias
-__all__ = ["LanguageToolChecker", "OllamaChecker"]
+__all__ = ["BatchCheckMixin", "Checker", "LanguageToolChecker", "OllamaChecker", "TextError"]
 
 
 def __getattr__(name):
-    """Lazy import para evitar importaciones eagerly."""
+    """Lazy import para evitar importaciones eagerly.
+
+    La clase importada se guarda en el módulo, así que los accesos siguientes
+    ya no pasan por __getattr__.
+    """
     if name == "LanguageToolChecker":
-        from src.checkers.languagetool import LanguageToolChecker
-        return LanguageToolChecker
+        from src.checkers.languagetool import LanguageToolChecker as value
     elif name == "OllamaChecker":
-        from src.checkers.ollama import OllamaChecker
-        return OllamaChecker
-    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        from src.checkers.ollama import OllamaChecker as value
+    elif name in ("BatchCheckMixin", "Checker"):
+        from src.checkers import base
+        value = getattr(base, name)
+    elif name == "TextError":
+        from src.checkers.errors import TextError as value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
@@ -0,0 +1,70 @@
+"""Parseo de las respuestas JSON de Ollama al formato estándar de errores.
+
+Módulo sin más dependencias del paquete que src.checkers.errors y con tipos
+completos para poder compilarlo como extensión C con mypyc (opcional; si existe la
+extensión compilada, Python la carga en lugar de este archivo):
+
+    mypyc src/checkers/_ollama_parse.py
+"""
+
+import json
+from typing import Any, List
+
+from src.checkers.errors import TextError
+
+
+def parse_llm_response(response_text: str) -> List[TextError]:
+    """Parsea la respuesta JSON del modelo (ver RESPONSE_SCHEMA) al formato estándar de errores.
+
+    Args:
+        response_text: Texto devuelto por el modelo
+
+    Returns:
+        Lista de errores encontrados
+
+    Raises:
+        ValueError: Si la respuesta no es JSON válido
+    """
+    data: Any = json.loads(response_text)
+    if not isinstance(data, dict):
+        return []
+    items: Any = data.get('errors')
+    if not isinstance(items, list):
+        return []
+
+    errors: List[TextError] = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        error_text: Any = item.get('error')
+        if not error_text:
+            continue
+        errors.append(make_llm_error(
+            str(error_text).strip(),
+            str(item.get('suggestion', '')).strip(),
+            str(item.get('type') or 'Redacción').strip(),
+            str(item.get('reason', '')).strip(),
+        ))
+    return errors
+
+
+def make_llm_error(error_text: str, suggestion: str, error_type: str, reason: str) -> TextError:
+    """Construye un error en el formato estándar.
+
+    Args:
+        error_text: Texto erróneo señalado por el modelo
+        suggestion: Corrección propuesta
+        error_type: Tipo de error (sin el prefijo "LLM-")
+        reason: Breve explicación
+
+    Returns:
+        Error de Ollama
+    """
+    return TextError(
+        word=error_text,
+        offset=-1,  # Ollama no provee offset exacto
+        suggestions=[suggestion] if suggestion else [],
+        context=f"...{error_text}...",
+        error_type=f"LLM-{error_type}",
+        reason=reason,
+    )
@@ -0,0 +1,47 @@
+"""Interfaz común de los checkers de texto."""
+
+from typing import Dict, List, Protocol, Tuple, runtime_checkable
+
+from src.checkers.errors import TextError
+
+
+@runtime_checkable
+class Checker(Protocol):
+    """Interfaz que el pipeline espera de un checker (página a página y por lotes).
+
+    check_batch() devuelve {página: errores}; una página cuya verificación
+    falló no aparece en el diccionario (distinto de una página sin errores).
+    """
+
+    def check(self, text: str, page_number: int) -> List[TextError]:
+        ...
+
+    def check_batch(self, pages: List[Tuple[int, str]]) -> Dict[int, List[TextError]]:
+        ...
+
+
+class BatchCheckMixin:
+    """check_batch() por defecto para checkers que solo saben verificar una página.
+
+    Verifica las páginas una a una con check(); los checkers que pueden
+    agrupar peticiones (LanguageTool con separadores, Ollama con
+    asyncio.gather) lo sobrescriben.
+
+    Ejemplo:
+        >>> class NuevoChecker(BatchCheckMixin):
+        ...     def check(self, text, page_number):
+        ...         return []
+        >>> NuevoChecker().check_batch([(0, "Texto."), (1, "Otro.")])
+        {0: [], 1: []}
+    """
+
+    def check_batch(self, pages: List[Tuple[int, str]]) -> Dict[int, List[TextError]]:
+        """Verifica varias páginas llamando a check() con cada una.
+
+        Args:
+            pages: Lista de tuplas (número de página, texto)
+
+        Returns:
+            Diccionario {número de página: lista de errores}
+        """
+        return {page_num: self.check(text, page_num) for page_num, text in pages}
@@ -0,0 +1,325 @@
+"""Caché persistente de resultados de los checkers (exacta y semántica)."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol
+
+# numpy y sentence-transformers (índice semántico, opcional) se importan al
+# crear el primer SemanticIndex: cargar torch cuesta segundos y este módulo lo
+# importan todos los procesos, también los de LanguageToolPool
+np = None  # type: ignore
+SentenceTransformer = None  # type: ignore
+
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None  # type: ignore
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+
+class CacheBackend(Protocol):
+    """Interfaz mínima de un almacén clave-valor para la caché."""
+
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    def set(self, key: str, value: Any) -> None:
+        ...
+
+    def delete(self, key: str) -> None:
+        ...
+
+
+class SQLiteCache:
+    """Almacén clave-valor persistente sobre SQLite (valores serializados en JSON).
+
+    Si orjson está instalado se usa para serializar (mismo JSON, más rápido).
+
+    Ejemplo:
+        >>> cache = SQLiteCache(Path("~/.cache/pdf_text_refiner/ollama.sqlite"))
+        >>> cache.set("clave", [{"word": "texo"}])
+        >>> cache.get("clave")
+    """
+
+    def __init__(self, path: Path):
+        """Abre (o crea) la base de datos de caché.
+
+        Args:
+            path: Ruta al fichero SQLite
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if not row:
+            return None
+        return orjson.loads(row[0]) if orjson is not None else json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        if orjson is not None:
+            data = orjson.dumps(value).decode('utf-8')
+        else:
+            data = json.dumps(value, ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO entries (key, value) VALUES (?, ?)", (key, data))
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _import_semantic_deps() -> None:
+    """Importa numpy y sentence-transformers la primera vez que se necesitan.
+
+    Raises:
+        ImportError: Si sentence-transformers o numpy no están instalados
+    """
+    global np, SentenceTransformer
+    if SentenceTransformer is not None:
+        return
+    try:
+        import numpy
+        from sentence_transformers import SentenceTransformer as model_class
+    except ImportError:
+        raise ImportError(
+            "sentence-transformers no está instalado. "
+            "Instala con: uv add sentence-transformers"
+        ) from None
+    np = numpy
+    SentenceTransformer = model_class
+
+
+class SemanticIndex:
+    """Índice de embeddings para encontrar textos casi idénticos ya analizados.
+
+    Usa sentence-transformers (all-MiniLM-L6-v2) y similitud coseno por fuerza
+    bruta sobre vectores normalizados; los vectores se persisten en SQLite.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        threshold: float = 0.95,
+    ):
+        """Inicializa el índice.
+
+        Args:
+            path: Ruta al fichero SQLite donde se guardan los vectores
+            model_name: Modelo de sentence-transformers para los embeddings
+            threshold: Similitud coseno mínima para aceptar un resultado
+
+        Raises:
+            ImportError: Si sentence-transformers o numpy no están instalados
+        """
+        _import_semantic_deps()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self._model = SentenceTransformer(model_name)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS vectors "
+                "(key TEXT PRIMARY KEY, namespace TEXT NOT NULL, vector BLOB NOT NULL)"
+            )
+
+        # Vectores en memoria agrupados por namespace (modelo + versión de prompt)
+        self._vectors: Dict[str, List] = {}
+        for key, namespace, blob in self._conn.execute("SELECT key, namespace, vector FROM vectors"):
+            self._vectors.setdefault(namespace, []).append((key, np.frombuffer(blob, dtype=np.float32)))
+
+    def _embed(self, text: str):
+        return self._model.encode(text, normalize_embeddings=True).astype(np.float32)
+
+    def lookup(self, namespace: str, text: str) -> Optional[str]:
+        """Busca el texto más parecido ya indexado.
+
+        Returns:
+            Clave de caché del vecino más cercano si supera el umbral, o None
+        """
+        entries = self._vectors.get(namespace)
+        if not entries:
+            return None
+
+        vector = self._embed(text)
+        with self._lock:
+            keys = [k for k, _ in entries]
+            scores = np.stack([v for _, v in entries]) @ vector
+        best = int(np.argmax(scores))
+        return keys[best] if scores[best] >= self.threshold else None
+
+    def add(self, namespace: str, text: str, key: str) -> None:
+        """Indexa un texto bajo la clave de caché dada."""
+        vector = self._embed(text)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO vectors (key, namespace, vector) VALUES (?, ?, ?)",
+                (key, namespace, vector.tobytes()),
+            )
+            self._vectors.setdefault(namespace, []).append((key, vector))
+
+
+class PromptCache:
+    """Caché en dos niveles para las respuestas del LLM.
+
+    1. Exacta: sha256 del modelo, la versión del prompt y el prompt completo.
+    2. Semántica (opcional): vecino más cercano por embeddings con coseno > umbral.
+
+    Ejemplo:
+        >>> cache = PromptCache(SQLiteCache(Path("ollama.sqlite")))
+        >>> cache.get("mistral", 1, prompt, text)
+    """
+
+    def __init__(self, backend: CacheBackend, semantic: Optional[SemanticIndex] = None):
+        """Inicializa la caché.
+
+        Args:
+            backend: Almacén clave-valor para los resultados
+            semantic: Índice semántico opcional
+        """
+        self.backend = backend
+        self.semantic = semantic
+        self.stats = {"hits": 0, "semantic_hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(model: str, prompt_version: int, prompt: str) -> str:
+        """Calcula la clave exacta de caché."""
+        payload = json.dumps({"model": model, "prompt_ver": prompt_version, "prompt": prompt}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _namespace(model: str, prompt_version: int) -> str:
+        return f"{model}:{prompt_version}"
+
+    def get(self, model: str, prompt_version: int, prompt: str, text: str) -> Optional[List[Dict]]:
+        """Busca un resultado en caché.
+
+        Args:
+            model: Modelo de Ollama
+            prompt_version: Versión del formato de prompt/respuesta
+            prompt: Prompt completo enviado al modelo
+            text: Texto analizado (para la búsqueda semántica)
+
+        Returns:
+            Lista de errores cacheada o None si no hay acierto
+        """
+        value = self.backend.get(self.make_key(model, prompt_version, prompt))
+        if value is not None:
+            self.stats["hits"] += 1
+            return value
+
+        if self.semantic is not None:
+            neighbour = self.semantic.lookup(self._namespace(model, prompt_version), text)
+            if neighbour is not None:
+                value = self.backend.get(neighbour)
+                if value is not None:
+                    self.stats["semantic_hits"] += 1
+                    return value
+
+        self.stats["misses"] += 1
+        return None
+
+    def set(self, model: str, prompt_version: int, prompt: str, text: str, errors: List[Dict]) -> None:
+        """Guarda un resultado en caché."""
+        key = self.make_key(model, prompt_version, prompt)
+        self.backend.set(key, errors)
+        if self.semantic is not None:
+            self.semantic.add(self._namespace(model, prompt_version), text, key)
+
+
+class TextCache:
+    """Caché exacta de resultados indexada por el hash del texto analizado.
+
+    Pensada para checkers deterministas (LanguageTool): el mismo texto con la
+    misma configuración (namespace) da siempre el mismo resultado, así que al
+    volver a analizar un documento solo se verifican las páginas que cambiaron.
+    El hash es blake3 si está instalado y blake2b en caso contrario.
+
+    Ejemplo:
+        >>> cache = TextCache(SQLiteCache(Path("languagetool.sqlite")))
+        >>> cache.set("es:1", "Texo de ejemplo.", [{"word": "Texo"}])
+        >>> cache.get("es:1", "Texo de ejemplo.")
+    """
+
+    def __init__(self, backend: CacheBackend):
+        """Inicializa la caché.
+
+        Args:
+            backend: Almacén clave-valor para los resultados
+        """
+        self.backend = backend
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(namespace: str, text: str) -> str:
+        """Calcula la clave de caché de un texto."""
+        data = text.encode('utf-8')
+        digest = blake3(data).hexdigest() if blake3 is not None else hashlib.blake2b(data).hexdigest()
+        return f"{namespace}:{digest}"
+
+    def get(self, namespace: str, text: str) -> Optional[List[Dict]]:
+        """Busca el resultado de un texto.
+
+        Args:
+            namespace: Configuración del checker (idioma, versión del resultado...)
+            text: Texto analizado
+
+        Returns:
+            Lista de errores cacheada o None si no hay acierto
+        """
+        value = self.backend.get(self.make_key(namespace, text))
+        self.stats["hits" if value is not None else "misses"] += 1
+        return value
+
+    def set(self, namespace: str, text: str, errors: List[Dict]) -> None:
+        """Guarda el resultado de un texto."""
+        self.backend.set(self.make_key(namespace, text), errors)
+
+
+def create_languagetool_cache(cache_dir: Path) -> TextCache:
+    """Crea la caché persistente de resultados de LanguageTool.
+
+    Args:
+        cache_dir: Directorio base de caché
+
+    Returns:
+        TextCache lista para usar
+    """
+    return TextCache(SQLiteCache(cache_dir / "languagetool.sqlite"))
+
+
+def create_prompt_cache(cache_dir: Path, semantic: bool = False, threshold: float = 0.95) -> PromptCache:
+    """Crea la caché persistente de prompts de Ollama.
+
+    Args:
+        cache_dir: Directorio base de caché
+        semantic: Activa el nivel semántico (requiere sentence-transformers)
+        threshold: Similitud coseno mínima para los aciertos semánticos
+
+    Returns:
+        PromptCache lista para usar
+    """
+    path = cache_dir / "ollama.sqlite"
+    index = SemanticIndex(path, threshold=threshold) if semantic else None
+    return PromptCache(SQLiteCache(path), index)
@@ -0,0 +1,66 @@
+"""Tipo común de los errores que devuelven los checkers.
+
+Módulo sin dependencias del resto del paquete (lo importa _ollama_parse,
+que puede compilarse con mypyc).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+
+@dataclass(slots=True)
+class TextError:
+    """Error detectado en una página por LanguageTool o por Ollama.
+
+    Con slots, cada error ocupa bastante menos memoria que un diccionario
+    con las mismas claves, y el acceso a los campos es un atributo fijo.
+
+    Attributes:
+        word: Texto erróneo
+        offset: Posición del error relativa a la página (-1 si se desconoce)
+        suggestions: Correcciones propuestas
+        context: Fragmento de texto alrededor del error
+        error_type: Categoría del error (las de Ollama empiezan por "LLM-")
+        reason: Breve explicación (solo Ollama)
+    """
+
+    word: str
+    offset: int
+    suggestions: List[str]
+    context: str
+    error_type: str
+    reason: str = ''
+
+
+def errors_to_json(errors: List[TextError]) -> List[Dict[str, Any]]:
+    """Convierte errores a diccionarios serializables en JSON (p. ej. para la caché).
+
+    Args:
+        errors: Lista de errores
+
+    Returns:
+        Lista de diccionarios con los campos de cada error
+    """
+    return [
+        {
+            'word': error.word,
+            'offset': error.offset,
+            'suggestions': error.suggestions,
+            'context': error.context,
+            'error_type': error.error_type,
+            'reason': error.reason,
+        }
+        for error in errors
+    ]
+
+
+def errors_from_json(items: List[Dict[str, Any]]) -> List[TextError]:
+    """Reconstruye los errores guardados con errors_to_json().
+
+    Args:
+        items: Lista de diccionarios (las entradas sin 'reason' lo dejan vacío)
+
+    Returns:
+        Lista de errores
+    """
+    return [TextError(**item) for item in items]
@@ -1,31 +1,68 @@
 """Checker de texto usando LanguageTool para ortografía y gramática."""
 
+from __future__ import annotations
+
+import multiprocessing
+import multiprocessing.util
 import os
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Tuple
+
+from src.checkers.base import BatchCheckMixin
+from src.checkers.cache import TextCache
+from src.checkers.errors import TextError, errors_from_json, errors_to_json
+from src.checkers.lt_server import ensure_shared_server, server_config
 
 try:
     import language_tool_python
 except ImportError:
     language_tool_python = None  # type: ignore
 
+# Separador entre páginas al agrupar varias en una sola petición
+PAGE_SEPARATOR = "\n\u241E PAGE_{} \u241E\n"
+
+# Máximo de caracteres por petición agrupada (límite práctico del servidor de LanguageTool)
+MAX_BATCH_CHARS = 20000
+
+# Versión del formato de los errores guardados en caché; cambiarla invalida la caché
+RESULT_VERSION = 1
 
-class LanguageToolChecker:
+# Campos de un Match que se leen en una sola llamada (en C) por error
+_MATCH_FIELDS = attrgetter('offset', 'errorLength', 'offsetInContext', 'context', 'category', 'replacements')
+
+
+class LanguageToolChecker(BatchCheckMixin):
     """Verificador de ortografía y gramática usando LanguageTool.
 
     Ejemplo:
         >>> checker = LanguageToolChecker(language="es")
         >>> checker.initialize()
         >>> errors = checker.check("Este es un texo con eror.", page_number=0)
+        >>> errors_by_page = checker.check_batch([(0, "Texo uno."), (1, "Texo dos.")])
         >>> checker.cleanup()
     """
 
-    def __init__(self, language: str = "es", cache_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        language: str = "es",
+        cache_dir: Optional[Path] = None,
+        remote_url: Optional[str] = None,
+        shared_server_port: Optional[int] = None,
+        result_cache: Optional[TextCache] = None,
+    ):
         """Inicializa el checker.
 
         Args:
             language: Código de idioma (default: "es")
             cache_dir: Directorio de caché para LanguageTool
+            remote_url: URL de un servidor de LanguageTool ya en marcha
+            shared_server_port: Puerto del servidor local compartido entre
+                procesos y ejecuciones (se arranca si no está en marcha).
+                Se ignora si se indica remote_url
+            result_cache: Caché persistente de resultados por página (None para desactivarla)
 
         Raises:
             ImportError: Si language_tool_python no está instalado
@@ -38,12 +75,17 @@ class LanguageToolChecker:
 
         self.language = language
         self.cache_dir = cache_dir or Path.home() / '.cache' / 'language_tool_python'
+        self.remote_url = remote_url
+        self.shared_server_port = shared_server_port
+        self.result_cache = result_cache
         self.tool: Optional[language_tool_python.LanguageTool] = None
 
     def initialize(self) -> None:
         """Inicializa LanguageTool.
 
-        Configura el caché persistente y carga la herramienta.
+        Configura el caché persistente y carga la herramienta. Con remote_url
+        o shared_server_port se conecta a un servidor existente (o al
+        compartido, arrancándolo si hace falta) en vez de lanzar uno propio.
         """
         # Configurar directorio de caché persistente
         self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -61,10 +103,19 @@ class LanguageToolChecker:
                 # Esta variable hace que download_lt() retorne inmediatamente sin descargar
                 os.environ['LTP_JAR_DIR_PATH'] = str(lt_dir)
 
-        self.tool = language_tool_python.LanguageTool(self.language)
+        url = self.remote_url
+        if url is None and self.shared_server_port is not None:
+            url = ensure_shared_server(self.shared_server_port, self.cache_dir)
+        if url is not None:
+            self.tool = language_tool_python.LanguageTool(self.language, remote_server=url)
+            print(f"✅ LanguageTool conectado a {url}")
+            return
+
+        # Todos los núcleos y caché de frases ya analizadas en el servidor Java
+        self.tool = language_tool_python.LanguageTool(self.language, config=server_config())
         print("✅ LanguageTool iniciado")
 
-    def check(self, text: str, page_number: int) -> List[Dict]:
+    def check(self, text: str, page_number: int) -> List[TextError]:
         """Verifica errores ortográficos y gramaticales usando LanguageTool.
 
         Args:
@@ -72,7 +123,7 @@ class LanguageToolChecker:
             page_number: Número de página (para referencia en el resultado)
 
         Returns:
-            Lista de diccionarios con los errores encontrados
+            Lista de errores encontrados
 
         Raises:
             RuntimeError: Si el checker no ha sido inicializado
@@ -83,28 +134,341 @@ class LanguageToolChecker:
         if not text.strip():
             return []
 
+        namespace = cache_namespace(self.language)
+        if self.result_cache is not None:
+            cached = self.result_cache.get(namespace, text)
+            if cached is not None:
+                return errors_from_json(cached)
+
         errors = []
 
         try:
             matches = self.tool.check(text)
 
-            for match in matches:
-                error_info = {
-                    'word': match.context[match.offsetInContext:match.offsetInContext + match.errorLength],
-                    'offset': match.offset,
-                    'suggestions': [r for r in match.replacements[:5]],  # Máximo 5 sugerencias
-                    'context': match.context,
-                    'error_type': match.category
-                }
-                errors.append(error_info)
+            make_error = self._make_error
+            errors = [make_error(*fields) for fields in map(_MATCH_FIELDS, matches)]
+
+            if self.result_cache is not None:
+                self.result_cache.set(namespace, text, errors_to_json(errors))
 
         except Exception as e:
             print(f"\n⚠️  Advertencia: Error al verificar con LanguageTool página {page_number + 1}: {str(e)}")
 
         return errors
 
+    def check_batch(self, pages: List[Tuple[int, str]]) -> Dict[int, List[TextError]]:
+        """Verifica varias páginas con una sola petición a LanguageTool.
+
+        Las páginas se concatenan con PAGE_SEPARATOR y cada error se asigna a su
+        página por búsqueda binaria sobre los offsets de inicio, ajustando el
+        offset para que sea relativo a la página. Los errores que caen en un
+        separador se descartan. Si el texto conjunto supera MAX_BATCH_CHARS,
+        se divide en varias peticiones. Con result_cache, solo se envían las
+        páginas que no estén ya en caché.
+
+        Args:
+            pages: Lista de tuplas (número de página, texto)
+
+        Returns:
+            Diccionario {número de página: lista de errores}. Las páginas de
+            una petición que falló no aparecen (se avisa por consola), para
+            que quien llama distinga "sin errores" de "sin resultado"
+
+        Raises:
+            RuntimeError: Si el checker no ha sido inicializado
+        """
+        if self.tool is None:
+            raise RuntimeError("LanguageToolChecker no ha sido inicializado. Llama a initialize() primero.")
+
+        if self.result_cache is not None:
+            return cached_check_batch(self.result_cache, self.language, pages, self._check_batch)
+        return self._check_batch(pages)
+
+    def _check_batch(self, pages: List[Tuple[int, str]]) -> Dict[int, List[TextError]]:
+        """check_batch() sin caché."""
+        results: Dict[int, List[TextError]] = {}
+
+        # Repartir en grupos de hasta MAX_BATCH_CHARS (una página más larga va sola)
+        group: List[Tuple[int, str]] = []
+        group_chars = 0
+        for page_num, text in pages:
+            if not text.strip():
+                results[page_num] = []
+                continue
+            size = len(text) + len(PAGE_SEPARATOR)
+            if group and group_chars + size > MAX_BATCH_CHARS:
+                self._check_group(group, results)
+                group, group_chars = [], 0
+            group.append((page_num, text))
+            group_chars += size
+        if group:
+            self._check_group(group, results)
+
+        return results
+
+    def _check_group(self, pages: List[Tuple[int, str]], results: Dict[int, List[TextError]]) -> None:
+        """Verifica un grupo de páginas con una sola petición y añade los errores a results.
+
+        Args:
+            pages: Páginas no vacías del grupo (número de página, texto)
+            results: Diccionario {número de página: lista de errores} a completar
+                (si la petición falla, las páginas del grupo no se añaden)
+        """
+        # Construir el texto conjunto y los offsets de inicio de cada página
+        parts = []
+        starts = []
+        position = 0
+        for i, (page_num, text) in enumerate(pages):
+            if i:
+                separator = PAGE_SEPARATOR.format(page_num + 1)
+                parts.append(separator)
+                position += len(separator)
+            starts.append(position)
+            parts.append(text)
+            position += len(text)
+
+        try:
+            matches = self.tool.check("".join(parts))
+        except Exception as e:
+            first, last = pages[0][0] + 1, pages[-1][0] + 1
+            print(f"\n⚠️  Advertencia: Error al verificar con LanguageTool páginas {first}-{last}: {str(e)}")
+            return
+
+        for page_num, _ in pages:
+            results[page_num] = []
+
+        make_error = self._make_error
+        for offset, error_length, offset_in_context, context, category, replacements in map(_MATCH_FIELDS, matches):
+            index = bisect_right(starts, offset) - 1
+            page_num, text = pages[index]
+            offset -= starts[index]
+            if offset + error_length > len(text):
+                continue
+            results[page_num].append(
+                make_error(offset, error_length, offset_in_context, context, category, replacements)
+            )
+
+    @staticmethod
+    def _make_error(
+        offset: int,
+        error_length: int,
+        offset_in_context: int,
+        context: str,
+        category: str,
+        replacements: List[str],
+    ) -> TextError:
+        """Construye un error a partir de los campos de un Match.
+
+        Args:
+            offset: Offset del error relativo a la página
+            error_length: Longitud del error
+            offset_in_context: Offset del error dentro del contexto
+            context: Fragmento de texto alrededor del error
+            category: Categoría de LanguageTool
+            replacements: Sugerencias de LanguageTool
+
+        Returns:
+            Error de LanguageTool
+        """
+        return TextError(
+            word=context[offset_in_context:offset_in_context + error_length],
+            offset=offset,
+            suggestions=replacements[:5],  # Máximo 5 sugerencias
+            context=context,
+            error_type=category,
+        )
+
     def cleanup(self) -> None:
-        """Limpia recursos y cierra LanguageTool."""
+        """Limpia recursos y cierra LanguageTool (un servidor remoto o compartido sigue en marcha)."""
         if self.tool is not None:
             self.tool.close()
             self.tool = None
+
+
+def cache_namespace(language: str) -> str:
+    """Namespace de la caché de resultados para un idioma."""
+    return f"languagetool:{language}:{RESULT_VERSION}"
+
+
+def cached_check_batch(
+    cache: TextCache,
+    language: str,
+    pages: List[Tuple[int, str]],
+    check_batch: Callable[[List[Tuple[int, str]]], Dict[int, List[TextError]]],
+) -> Dict[int, List[TextError]]:
+    """Resuelve desde la caché las páginas ya analizadas y verifica el resto.
+
+    Args:
+        cache: Caché persistente de resultados
+        language: Código de idioma
+        pages: Lista de tuplas (número de página, texto)
+        check_batch: Verificación sin caché de las páginas que falten (las
+            que no devuelva se consideran fallidas y no se guardan)
+
+    Returns:
+        Diccionario {número de página: lista de errores}, sin las páginas
+        cuya verificación falló
+    """
+    namespace = cache_namespace(language)
+    results: Dict[int, List[TextError]] = {}
+    missing: List[Tuple[int, str]] = []
+    for page_num, text in pages:
+        cached = cache.get(namespace, text) if text.strip() else []
+        if cached is None:
+            missing.append((page_num, text))
+        else:
+            results[page_num] = errors_from_json(cached)
+
+    if missing:
+        checked = check_batch(missing)
+        for page_num, text in missing:
+            errors = checked.get(page_num)
+            if errors is None:
+                # La petición falló: ni resultado ni entrada en la caché
+                continue
+            results[page_num] = errors
+            cache.set(namespace, text, errors_to_json(errors))
+
+    return results
+
+
+# Checker propio de cada proceso de LanguageToolPool
+_worker_checker: Optional[LanguageToolChecker] = None
+
+
+def _init_worker(
+    language: str,
+    cache_dir: Optional[Path],
+    remote_url: Optional[str],
+    shared_server_port: Optional[int],
+) -> None:
+    """Arranca el servidor de LanguageTool de un proceso del pool (o se conecta al compartido)."""
+    global _worker_checker
+    _worker_checker = LanguageToolChecker(
+        language=language,
+        cache_dir=cache_dir,
+        remote_url=remote_url,
+        shared_server_port=shared_server_port,
+    )
+    _worker_checker.initialize()
+    # Los procesos del pool salen con os._exit (sin atexit): cerrar Java al terminar
+    multiprocessing.util.Finalize(_worker_checker, _worker_checker.cleanup, exitpriority=10)
+
+
+def _worker_check_batch(pages: List[Tuple[int, str]]) -> Dict[int, List[TextError]]:
+    return _worker_checker._check_batch(pages)
+
+
+def _worker_ready(_: int) -> int:
+    return os.getpid()
+
+
+class LanguageToolPool(BatchCheckMixin):
+    """Varios servidores de LanguageTool, uno por proceso, tras la interfaz de LanguageToolChecker.
+
+    Cada proceso (contexto spawn) crea su propio LanguageToolChecker con su
+    servidor Java local, así que N lotes se verifican a la vez en N núcleos.
+    Con remote_url o shared_server_port, todos los procesos envían sus lotes
+    al mismo servidor en lugar de arrancar uno cada uno.
+    check_batch() bloquea el hilo que lo llama hasta que un proceso libre
+    devuelve el resultado; el pipeline lanza tantos lotes simultáneos como
+    procesos haya.
+
+    Ejemplo:
+        >>> pool = LanguageToolPool(language="es", workers=4)
+        >>> pool.initialize()
+        >>> errors_by_page = pool.check_batch([(0, "Texo uno."), (1, "Texo dos.")])
+        >>> pool.cleanup()
+    """
+
+    def __init__(
+        self,
+        language: str = "es",
+        cache_dir: Optional[Path] = None,
+        workers: int = 2,
+        remote_url: Optional[str] = None,
+        shared_server_port: Optional[int] = None,
+        result_cache: Optional[TextCache] = None,
+    ):
+        """Inicializa el pool (los procesos se arrancan en initialize()).
+
+        Args:
+            language: Código de idioma (default: "es")
+            cache_dir: Directorio de caché para LanguageTool
+            workers: Número de procesos (y servidores de LanguageTool)
+            remote_url: URL de un servidor de LanguageTool ya en marcha
+            shared_server_port: Puerto del servidor local compartido
+            result_cache: Caché persistente de resultados por página; se
+                consulta en el proceso principal antes de repartir el lote
+
+        Raises:
+            ImportError: Si language_tool_python no está instalado
+        """
+        if language_tool_python is None:
+            raise ImportError(
+                "language-tool-python no está instalado. "
+                "Instala con: uv add language-tool-python"
+            )
+
+        self.language = language
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.remote_url = remote_url
+        self.shared_server_port = shared_server_port
+        self.result_cache = result_cache
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def initialize(self) -> None:
+        """Arranca los procesos y espera a que todos tengan LanguageTool listo.
+
+        Raises:
+            concurrent.futures.process.BrokenProcessPool: Si algún proceso no pudo iniciar LanguageTool
+        """
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.language, self.cache_dir, self.remote_url, self.shared_server_port),
+        )
+        list(self._executor.map(_worker_ready, range(self.workers)))
+
+    def check(self, text: str, page_number: int) -> List[TextError]:
+        """Verifica una página en uno de los procesos.
+
+        Args:
+            text: Texto a verificar
+            page_number: Número de página (para referencia en el resultado)
+
+        Returns:
+            Lista de errores encontrados
+        """
+        return self.check_batch([(page_number, text)]).get(page_number, [])
+
+    def check_batch(self, pages: List[Tuple[int, str]]) -> Dict[int, List[TextError]]:
+        """Verifica un lote de páginas en uno de los procesos (ver LanguageToolChecker.check_batch).
+
+        Args:
+            pages: Lista de tuplas (número de página, texto)
+
+        Returns:
+            Diccionario {número de página: lista de errores}, sin las páginas
+            cuya verificación falló
+
+        Raises:
+            RuntimeError: Si el pool no ha sido inicializado
+        """
+        if self._executor is None:
+            raise RuntimeError("LanguageToolPool no ha sido inicializado. Llama a initialize() primero.")
+
+        if self.result_cache is not None:
+            return cached_check_batch(self.result_cache, self.language, pages, self._check_batch)
+        return self._check_batch(pages)
+
+    def _check_batch(self, pages: List[Tuple[int, str]]) -> Dict[int, List[TextError]]:
+        return self._executor.submit(_worker_check_batch, pages).result()
+
+    def cleanup(self) -> None:
+        """Detiene los procesos y sus servidores de LanguageTool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
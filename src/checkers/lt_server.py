@@ -0,0 +1,121 @@
+"""Servidor de LanguageTool de larga duración compartido entre procesos y ejecuciones."""
+
+import fcntl
+import os
+import subprocess
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, Union
+
+# Tiempo máximo de espera a que el servidor recién lanzado responda
+READY_TIMEOUT_SECONDS = 120
+
+# Frases analizadas que guarda la caché del servidor (cabeceras, pies y
+# numeraciones se repiten en casi todas las páginas)
+SERVER_CACHE_SIZE = 10000
+
+
+def server_is_up(url: str) -> bool:
+    """Indica si hay un servidor de LanguageTool respondiendo en url.
+
+    Args:
+        url: URL base del servidor (p. ej. http://localhost:8081)
+    """
+    try:
+        with urllib.request.urlopen(f"{url.rstrip('/')}/v2/languages", timeout=2) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def server_config() -> Dict[str, Union[int, bool]]:
+    """Configuración de los servidores de LanguageTool que arranca el analizador.
+
+    Activa la caché de resultados y de pipelines de LanguageTool (las frases
+    repetidas no se vuelven a tokenizar ni etiquetar) y permite que el
+    servidor use todos los núcleos. Formato del parámetro config de
+    language_tool_python.LanguageTool.
+    """
+    return {
+        'maxCheckThreads': os.cpu_count() or 1,
+        'cacheSize': SERVER_CACHE_SIZE,
+        'pipelineCaching': True,
+    }
+
+
+def write_server_config(path: Path) -> Path:
+    """Escribe server_config() como archivo de configuración del servidor (lt.cfg).
+
+    Args:
+        path: Ruta del archivo de configuración
+
+    Returns:
+        Ruta del archivo escrito
+    """
+    lines = []
+    for key, value in server_config().items():
+        if isinstance(value, bool):
+            value = str(value).lower()
+        lines.append(f"{key}={value}\n")
+    path.write_text("".join(lines), encoding='utf-8')
+    return path
+
+
+def ensure_shared_server(port: int, cache_dir: Path) -> str:
+    """Devuelve la URL del servidor compartido, arrancándolo si no está en marcha.
+
+    El servidor se lanza como proceso independiente (sobrevive a esta
+    ejecución y lo reutilizan las siguientes y los procesos de
+    LanguageToolPool). Un lock de archivo evita que dos procesos lo arranquen
+    a la vez: el segundo espera y reutiliza el del primero.
+
+    Args:
+        port: Puerto local del servidor
+        cache_dir: Directorio de caché de LanguageTool (lock, lt.cfg y log)
+
+    Returns:
+        URL base del servidor (http://localhost:<port>)
+
+    Raises:
+        RuntimeError: Si el servidor no llega a responder
+    """
+    url = f"http://localhost:{port}"
+    if server_is_up(url):
+        return url
+
+    from language_tool_python.download_lt import download_lt
+    from language_tool_python.utils import get_jar_info
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with open(cache_dir / "lt_server.lock", 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        # Otro proceso pudo arrancarlo mientras esperábamos el lock
+        if server_is_up(url):
+            return url
+
+        download_lt()
+        java_path, jar_path = get_jar_info()
+        config_path = write_server_config(cache_dir / "lt.cfg")
+        with open(cache_dir / "lt_server.log", 'ab') as log:
+            process = subprocess.Popen(
+                [java_path, '-cp', jar_path, 'org.languagetool.server.HTTPServer',
+                 '--port', str(port), '--allow-origin', '*', '--config', str(config_path)],
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+
+        deadline = time.monotonic() + READY_TIMEOUT_SECONDS
+        while not server_is_up(url):
+            if process.poll() is not None:
+                raise RuntimeError(
+                    f"El servidor de LanguageTool terminó al arrancar (ver {cache_dir / 'lt_server.log'})"
+                )
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"El servidor de LanguageTool no respondió en {url}")
+            time.sleep(0.5)
+
+    print(f"🚀 Servidor LanguageTool compartido iniciado en {url}")
+    return url
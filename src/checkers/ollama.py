@@ -1,28 +1,111 @@
 """Checker de texto usando Ollama LLM para análisis de redacción y estilo."""
 
-from typing import List, Dict
+from __future__ import annotations
+
+import asyncio
+from typing import List, Dict, Optional, Sequence, Tuple, Union
 
 try:
     import ollama
 except ImportError:
     ollama = None  # type: ignore
 
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None  # type: ignore
+
+from src.checkers._ollama_parse import parse_llm_response
+from src.checkers.base import BatchCheckMixin
+from src.checkers.cache import PromptCache
+from src.checkers.errors import TextError, errors_from_json, errors_to_json
+from src.checkers.ollama_pool import OllamaEndpointPool, get_client, is_busy_error, parse_hosts
+
+# Versión del prompt/formato de respuesta; cambiarla invalida la caché persistente
+PROMPT_VERSION = 6
+
+# Reintentos cuando el servidor responde que está ocupado (429/503) y espera base entre ellos
+OVERLOAD_RETRIES = 3
+OVERLOAD_BACKOFF_SECONDS = 1.0
 
-class OllamaChecker:
+# Estimación de caracteres por token cuando tiktoken no está disponible
+CHARS_PER_TOKEN = 4
+
+# Tokens compartidos por ventanas consecutivas de una página larga
+WINDOW_OVERLAP_TOKENS = 100
+
+# Esquema JSON de la respuesta (salida estructurada de Ollama, parámetro format=)
+RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "errors": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "type": {"type": "string"},
+                    "error": {"type": "string"},
+                    "suggestion": {"type": "string"},
+                    "reason": {"type": "string"},
+                },
+                "required": ["type", "error", "suggestion"],
+            },
+        },
+    },
+    "required": ["errors"],
+}
+
+# Instrucciones (mensaje de sistema): idénticas byte a byte en todas las páginas para
+# que Ollama reutilice su caché KV. No interpolar aquí nada que dependa de la página.
+SYSTEM_PROMPT = """Eres un corrector profesional de textos en español. Analiza el texto que envía el usuario y encuentra TODOS los errores de:
+1. Redacción (construcción de frases, claridad)
+2. Coherencia (ideas que no fluyen bien)
+3. Concordancia (género, número, tiempo verbal)
+4. Estilo (repeticiones innecesarias, redundancias)
+5. Puntuación incorrecta o faltante
+
+IMPORTANTE: Solo reporta errores REALES. No inventes errores que no existen.
+
+Por cada error: type (tipo), error (texto erróneo), suggestion (corrección), reason (breve explicación)."""
+
+
+class OllamaChecker(BatchCheckMixin):
     """Verificador de redacción y estilo usando Ollama LLM.
 
     Ejemplo:
         >>> checker = OllamaChecker(model="llama3:8b", host="http://localhost:11434")
         >>> errors = checker.check("Este es un texto.", page_number=0)
+
+    Con varios hosts (separados por comas), check_async() reparte las páginas
+    entre todos los servidores mediante OllamaEndpointPool.
     """
 
-    def __init__(self, model: str = "llama3:8b", host: str = "http://localhost:11434", timeout: int = 120):
+    def __init__(
+        self,
+        model: str = "llama3:8b",
+        host: Union[str, Sequence[str]] = "http://localhost:11434",
+        timeout: int = 120,
+        max_concurrency: int = 8,
+        initial_concurrency: int = 2,
+        cache: Optional[PromptCache] = None,
+        max_input_tokens: int = 1500,
+        num_ctx: int = 4096,
+        num_predict: int = 512,
+        keep_alive: str = "1h",
+    ):
         """Inicializa el checker de Ollama.
 
         Args:
             model: Modelo de Ollama a usar
-            host: URL del servidor Ollama
+            host: URL del servidor Ollama, o varias separadas por comas
             timeout: Timeout en segundos para las peticiones
+            max_concurrency: Máximo de peticiones simultáneas por servidor en check_async()
+            initial_concurrency: Concurrencia inicial por servidor (se ajusta con AIMD)
+            cache: Caché persistente de respuestas (None para desactivarla)
+            max_input_tokens: Máximo de tokens por petición; las páginas más largas se dividen en ventanas
+            num_ctx: Tamaño de contexto del modelo
+            num_predict: Máximo de tokens de respuesta
+            keep_alive: Tiempo que Ollama mantiene el modelo cargado
 
         Raises:
             ImportError: Si ollama no está instalado
@@ -34,11 +117,21 @@ class OllamaChecker:
             )
 
         self.model = model
-        self.host = host
+        self.hosts = parse_hosts(host)
+        self.host = self.hosts[0]
         self.timeout = timeout
-        self.client = ollama.Client(host=host, timeout=timeout)
+        self.max_concurrency = max_concurrency
+        self.initial_concurrency = initial_concurrency
+        self.cache = cache
+        self.max_input_tokens = max_input_tokens
+        self.keep_alive = keep_alive
+        self.options = {'num_ctx': num_ctx, 'num_predict': num_predict, 'temperature': 0.0}
+        self._encoding = tiktoken.get_encoding('cl100k_base') if tiktoken is not None else None
+        self.client = get_client(self.host, timeout)
+        self._pool: Optional[OllamaEndpointPool] = None
+        self._pool_loop: Optional[asyncio.AbstractEventLoop] = None
 
-    def check(self, text: str, page_number: int) -> List[Dict]:
+    def check(self, text: str, page_number: int) -> List[TextError]:
         """Analiza el texto usando un modelo de Ollama para encontrar errores de redacción.
 
         Args:
@@ -46,78 +139,263 @@ class OllamaChecker:
             page_number: Número de página (para referencia)
 
         Returns:
-            Lista de diccionarios con errores encontrados
+            Lista de errores encontrados
         """
         if not text.strip():
             return []
 
+        windows = self._windows(text)
+        if len(windows) == 1:
+            return self._check_window(windows[0], page_number)
+        return self._merge_windows([self._check_window(window, page_number) for window in windows])
+
+    def _check_window(self, prompt: str, page_number: int) -> List[TextError]:
+        """Analiza una ventana de texto (cabe en max_input_tokens) con el cliente síncrono."""
         errors = []
 
+        if self.cache is not None:
+            cached = self.cache.get(self.model, PROMPT_VERSION, prompt, prompt)
+            if cached is not None:
+                return errors_from_json(cached)
+
         try:
-            prompt = f"""Eres un corrector profesional de textos en español. Analiza el siguiente texto y encuentra TODOS los errores de:
-1. Redacción (construcción de frases, claridad)
-2. Coherencia (ideas que no fluyen bien)
-3. Concordancia (género, número, tiempo verbal)
-4. Estilo (repeticiones innecesarias, redundancias)
-5. Puntuación incorrecta o faltante
+            response = self.client.chat(**self._chat_kwargs(prompt))
+            errors = self._parse_response(response['message']['content'])
 
-IMPORTANTE: Solo reporta errores REALES. No inventes errores que no existen.
+            if self.cache is not None:
+                self.cache.set(self.model, PROMPT_VERSION, prompt, prompt, errors_to_json(errors))
+
+        except Exception as e:
+            print(f"\n⚠️  Advertencia: Error al verificar con Ollama página {page_number + 1}: {str(e)}")
+
+        return errors
 
-Formato de respuesta (un error por línea):
-LÍNEA [número aproximado] | TIPO: [tipo de error] | ERROR: "[texto erróneo]" | SUGERENCIA: "[corrección]" | RAZÓN: [breve explicación]
+    def warm_up(self, host: Optional[str] = None) -> bool:
+        """Carga el modelo en memoria de Ollama antes de analizar la primera página.
 
-Si no hay errores, responde: "NO_ERRORS"
+        Ollama carga el modelo sin generar nada cuando no hay mensajes. Se
+        usan las mismas options que en el análisis: con otro num_ctx, Ollama
+        tendría que volver a cargarlo en la primera petición real.
 
-Texto a analizar:
-{text[:2000]}
-"""
+        Args:
+            host: Servidor a precargar (default: el primero de self.hosts)
 
-            # Generar respuesta
-            response = self.client.generate(
+        Returns:
+            True si el modelo quedó cargado, False en caso contrario
+        """
+        host = host or self.host
+        try:
+            get_client(host, self.timeout).chat(
                 model=self.model,
-                prompt=prompt,
-                stream=False
+                messages=[],
+                keep_alive=self.keep_alive,
+                options={**self.options, 'num_predict': 1},
             )
+        except Exception as e:
+            print(f"\n⚠️  Advertencia: No se pudo precargar el modelo {self.model} en {host}: {str(e)}")
+            return False
+        return True
 
-            response_text = response['response'].strip()
-
-            # Parsear respuesta
-            if response_text == "NO_ERRORS" or "NO_ERRORS" in response_text.upper():
-                return []
-
-            lines = response_text.split('\n')
-            for line in lines:
-                if '|' in line and 'ERROR:' in line:
-                    try:
-                        # Parsear formato: LÍNEA X | TIPO: Y | ERROR: "Z" | SUGERENCIA: "W" | RAZÓN: R
-                        parts = line.split('|')
-
-                        error_part = [p for p in parts if 'ERROR:' in p]
-                        suggestion_part = [p for p in parts if 'SUGERENCIA:' in p]
-                        type_part = [p for p in parts if 'TIPO:' in p]
-                        reason_part = [p for p in parts if 'RAZÓN:' in p or 'RAZON:' in p]
-
-                        if error_part:
-                            error_text = error_part[0].split('ERROR:')[1].strip().strip('"')
-                            suggestion = suggestion_part[0].split('SUGERENCIA:')[1].strip().strip('"') if suggestion_part else "revisar manualmente"
-                            error_type = type_part[0].split('TIPO:')[1].strip() if type_part else "Redacción"
-                            reason = reason_part[0].split('RAZÓN:' if 'RAZÓN:' in reason_part[0] else 'RAZON:')[1].strip() if reason_part else ""
-
-                            error_info = {
-                                'word': error_text,
-                                'offset': -1,  # Ollama no provee offset exacto
-                                'suggestions': [suggestion] if suggestion else [],
-                                'context': f"...{error_text}...",
-                                'error_type': f"LLM-{error_type}",
-                                'reason': reason
-                            }
-                            errors.append(error_info)
-
-                    except Exception as parse_error:
-                        # Si falla el parsing, continuar con el siguiente error
-                        continue
+    async def check_async(self, text: str, page_number: int) -> List[TextError]:
+        """Versión asíncrona de check() usando ollama.AsyncClient.
 
-        except Exception as e:
-            print(f"\n⚠️  Advertencia: Error al verificar con Ollama página {page_number + 1}: {str(e)}")
+        Permite solapar varias peticiones a Ollama con la extracción y
+        LanguageTool dentro del pipeline asíncrono. Si un servidor falla
+        (también por timeout), la petición pasa al siguiente endpoint del
+        pool, como mucho una vez por endpoint; si responde que está ocupado
+        (429/503), se reintenta tras una espera creciente (el limitador
+        adaptativo ya habrá reducido su concurrencia).
 
-        return errors
+        Las páginas de más de max_input_tokens tokens se dividen en ventanas
+        solapadas (WINDOW_OVERLAP_TOKENS) que se analizan a la vez.
+
+        Args:
+            text: Texto a analizar
+            page_number: Número de página (para referencia)
+
+        Returns:
+            Lista de errores encontrados
+        """
+        if not text.strip():
+            return []
+
+        windows = self._windows(text)
+        if len(windows) == 1:
+            return await self._check_window_async(windows[0], page_number)
+        results = await asyncio.gather(*(self._check_window_async(window, page_number) for window in windows))
+        return self._merge_windows(results)
+
+    async def _check_window_async(self, prompt: str, page_number: int) -> List[TextError]:
+        """Analiza una ventana de texto (cabe en max_input_tokens) a través del pool de endpoints."""
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.get, self.model, PROMPT_VERSION, prompt, prompt)
+            if cached is not None:
+                return errors_from_json(cached)
+
+        pool = self._get_pool()
+        tried = []
+        failures = 0
+        overloads = 0
+        last_error: Optional[Exception] = None
+
+        while failures < len(pool) and overloads <= OVERLOAD_RETRIES:
+            endpoint = None
+            try:
+                async with pool.acquire(exclude=tried) as endpoint:
+                    response = await endpoint.client.chat(**self._chat_kwargs(prompt))
+            except Exception as e:
+                last_error = e
+                if is_busy_error(e):
+                    # Servidor vivo pero ocupado: reintentar tras una espera creciente
+                    # (sin esperar si ya no quedan reintentos)
+                    overloads += 1
+                    if overloads <= OVERLOAD_RETRIES:
+                        await asyncio.sleep(OVERLOAD_BACKOFF_SECONDS * overloads)
+                else:
+                    # Timeouts, caídas y demás errores: pasar al siguiente endpoint
+                    failures += 1
+                    if endpoint is not None:
+                        tried.append(endpoint)
+                continue
+
+            try:
+                errors = self._parse_response(response['message']['content'])
+            except Exception as e:
+                last_error = e
+                break
+
+            if self.cache is not None:
+                await asyncio.to_thread(
+                    self.cache.set, self.model, PROMPT_VERSION, prompt, prompt, errors_to_json(errors)
+                )
+            return errors
+
+        print(f"\n⚠️  Advertencia: Error al verificar con Ollama página {page_number + 1}: {str(last_error)}")
+        return []
+
+    def check_batch(self, pages: List[Tuple[int, str]]) -> Dict[int, List[TextError]]:
+        """Analiza varias páginas a la vez con check_async() y asyncio.gather().
+
+        Las peticiones se lanzan juntas (limitadas por la concurrencia
+        adaptativa de cada servidor), así que Ollama puede procesarlas en el
+        mismo lote si se arrancó con OLLAMA_NUM_PARALLEL >= número de
+        peticiones simultáneas. Punto de entrada síncrono: no debe llamarse
+        desde un event loop en marcha (ahí se usa check_async() directamente).
+
+        Args:
+            pages: Lista de tuplas (número de página, texto)
+
+        Returns:
+            Diccionario {número de página: lista de errores}
+        """
+        async def check_all() -> List[List[TextError]]:
+            return await asyncio.gather(*(self.check_async(text, page_num) for page_num, text in pages))
+
+        results = asyncio.run(check_all())
+        return {page_num: errors for (page_num, _), errors in zip(pages, results)}
+
+    def _get_pool(self) -> OllamaEndpointPool:
+        """Obtiene el pool de endpoints ligado al event loop actual.
+
+        httpx asocia su pool de conexiones al loop en el que se usa por
+        primera vez, por lo que se recrea el pool si cambia el loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._pool is None or self._pool_loop is not loop:
+            self._pool = OllamaEndpointPool(
+                self.hosts,
+                timeout=self.timeout,
+                max_concurrency=self.max_concurrency,
+                initial_concurrency=self.initial_concurrency,
+            )
+            self._pool_loop = loop
+        return self._pool
+
+    def describe_concurrency(self) -> str:
+        """Concurrencia actual por servidor (para logs de depuración)."""
+        if self._pool is None:
+            return "sin peticiones"
+        return self._pool.describe()
+
+    def _windows(self, text: str) -> List[str]:
+        """Divide el texto en ventanas de hasta max_input_tokens tokens.
+
+        Las ventanas consecutivas comparten WINDOW_OVERLAP_TOKENS tokens para
+        que los errores en una frontera queden enteros en alguna de ellas.
+        Con tiktoken se cuentan tokens BPE reales; sin él se estima a razón de
+        CHARS_PER_TOKEN caracteres por token.
+
+        Args:
+            text: Texto de la página
+
+        Returns:
+            Lista de ventanas (una sola si el texto cabe entero)
+        """
+        size = self.max_input_tokens
+        overlap = min(WINDOW_OVERLAP_TOKENS, size // 2)
+
+        if self._encoding is None:
+            size *= CHARS_PER_TOKEN
+            overlap *= CHARS_PER_TOKEN
+            if len(text) <= size:
+                return [text]
+            return [text[i:i + size] for i in range(0, len(text) - overlap, size - overlap)]
+
+        tokens = self._encoding.encode(text)
+        if len(tokens) <= size:
+            return [text]
+        return [self._encoding.decode(tokens[i:i + size]) for i in range(0, len(tokens) - overlap, size - overlap)]
+
+    @staticmethod
+    def _merge_windows(results: List[List[TextError]]) -> List[TextError]:
+        """Une los errores de las ventanas de una página.
+
+        Los errores detectados en el solapamiento aparecen en dos ventanas;
+        como Ollama no da offsets, se consideran iguales los que coinciden en
+        texto y tipo, y se conserva el primero.
+
+        Args:
+            results: Errores de cada ventana, en orden
+
+        Returns:
+            Lista de errores sin duplicados
+        """
+        seen = set()
+        merged = []
+        for errors in results:
+            for error in errors:
+                key = (error.word, error.error_type)
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(error)
+        return merged
+
+    def _chat_kwargs(self, prompt: str) -> Dict:
+        """Argumentos comunes de las llamadas a chat().
+
+        Las instrucciones van en el mensaje de sistema (SYSTEM_PROMPT, fijo) y
+        solo el texto de la página en el de usuario, así Ollama reutiliza la
+        caché KV del prefijo común entre páginas. num_ctx fijo evita que
+        Ollama recargue el modelo o reevalúe el prompt entre páginas,
+        think=False impide que los modelos de razonamiento consuman el
+        presupuesto de salida en silencio, y format restringe la salida a
+        RESPONSE_SCHEMA.
+
+        Args:
+            prompt: Texto de la página ya recortado
+        """
+        return {
+            'model': self.model,
+            'messages': [
+                {'role': 'system', 'content': SYSTEM_PROMPT},
+                {'role': 'user', 'content': prompt},
+            ],
+            'stream': False,
+            'think': False,
+            'options': self.options,
+            'keep_alive': self.keep_alive,
+            'format': RESPONSE_SCHEMA,
+        }
+
+    # Parseo en un módulo aparte, compilable con mypyc (ver _ollama_parse.py)
+    _parse_response = staticmethod(parse_llm_response)
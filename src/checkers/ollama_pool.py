@@ -0,0 +1,318 @@
+"""Clientes de Ollama: cliente síncrono compartido y pool de endpoints con circuit breaker."""
+
+import asyncio
+import functools
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Sequence, Union
+
+try:
+    import ollama
+except ImportError:
+    ollama = None  # type: ignore
+
+try:
+    import httpx
+except ImportError:
+    httpx = None  # type: ignore
+
+# Códigos HTTP que indican que el servidor está saturado
+OVERLOAD_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Códigos de "ocupado": el servidor responde, así que no cuentan para el circuit breaker
+BUSY_STATUS_CODES = {429, 503}
+
+# Timeout de conexión: un host caído no debe bloquear durante todo el timeout de generación
+CONNECT_TIMEOUT_SECONDS = 5.0
+
+
+@functools.lru_cache(maxsize=8)
+def get_client(host: str, timeout: int = 120) -> "ollama.Client":
+    """Devuelve el cliente síncrono de Ollama para un host, creado una sola vez.
+
+    Reutilizar el cliente mantiene abierta la conexión HTTP entre la
+    verificación inicial y las peticiones de cada página.
+
+    Args:
+        host: URL del servidor Ollama
+        timeout: Timeout en segundos para las peticiones
+
+    Returns:
+        Cliente de Ollama compartido para (host, timeout)
+
+    Raises:
+        ImportError: Si ollama no está instalado
+    """
+    if ollama is None:
+        raise ImportError(
+            "ollama no está instalado. "
+            "Instala con: uv add ollama"
+        )
+    if httpx is not None:
+        return ollama.Client(host=host, timeout=httpx.Timeout(timeout, connect=CONNECT_TIMEOUT_SECONDS))
+    return ollama.Client(host=host, timeout=timeout)
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Indica si un error de Ollama se debe a sobrecarga del servidor.
+
+    Se consideran sobrecarga los timeouts, las conexiones cortadas y las
+    respuestas 429/5xx; el resto (p. ej. modelo inexistente) no lo son.
+    """
+    if isinstance(error, (asyncio.TimeoutError, ConnectionResetError)):
+        return True
+    if ollama is not None and isinstance(error, ollama.ResponseError):
+        return error.status_code in OVERLOAD_STATUS_CODES
+    if httpx is not None and isinstance(error, (httpx.TimeoutException, httpx.RemoteProtocolError)):
+        return True
+    return False
+
+
+def is_busy_error(error: BaseException) -> bool:
+    """Indica si Ollama rechazó la petición por estar ocupado (429/503)."""
+    return (
+        ollama is not None
+        and isinstance(error, ollama.ResponseError)
+        and error.status_code in BUSY_STATUS_CODES
+    )
+
+
+class AdaptiveLimiter:
+    """Limitador de concurrencia AIMD (aumento aditivo, reducción multiplicativa).
+
+    Cada petición correcta aumenta el límite en 1/límite (≈ +1 por cada
+    ronda completa de peticiones) y cada sobrecarga lo multiplica por
+    backoff; los demás errores (conexión rechazada, modelo inexistente,
+    respuesta inválida) no lo modifican, de modo que la concurrencia converge al punto de saturación
+    real del servidor sin ajustes manuales.
+
+    Ejemplo:
+        >>> limiter = AdaptiveLimiter(min_limit=1, max_limit=8, initial=2)
+        >>> async with limiter:
+        ...     await client.chat(...)
+    """
+
+    def __init__(self, min_limit: int = 1, max_limit: int = 8, initial: int = 2, backoff: float = 0.5):
+        """Inicializa el limitador.
+
+        Args:
+            min_limit: Concurrencia mínima
+            max_limit: Concurrencia máxima
+            initial: Concurrencia inicial
+            backoff: Factor de reducción ante sobrecarga
+        """
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.backoff = backoff
+        self.limit = float(min(max(initial, min_limit), self.max_limit))
+        self.in_use = 0
+        self._condition = asyncio.Condition()
+
+    @property
+    def concurrency(self) -> int:
+        """Número de peticiones simultáneas permitidas ahora mismo."""
+        return max(self.min_limit, int(self.limit))
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_use < self.concurrency)
+            self.in_use += 1
+
+    async def release(self, error: Optional[BaseException] = None) -> None:
+        """Libera un hueco y ajusta el límite según el resultado.
+
+        Args:
+            error: Excepción de la petición (None si fue correcta). Solo las
+                de sobrecarga (is_overload_error) reducen el límite
+        """
+        async with self._condition:
+            self.in_use -= 1
+            if error is None:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            elif is_overload_error(error):
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+            self._condition.notify_all()
+
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.release(exc)
+
+
+def parse_hosts(hosts: Union[str, Sequence[str]]) -> List[str]:
+    """Normaliza una lista de hosts de Ollama.
+
+    Args:
+        hosts: URL única, URLs separadas por comas o secuencia de URLs
+
+    Returns:
+        Lista de URLs sin espacios ni duplicados, en el orden original
+    """
+    if isinstance(hosts, str):
+        hosts = hosts.split(',')
+
+    result = []
+    for host in hosts:
+        host = host.strip()
+        if host and host not in result:
+            result.append(host)
+    return result
+
+
+class OllamaEndpoint:
+    """Estado de un endpoint de Ollama: cliente, concurrencia y salud."""
+
+    def __init__(self, url: str, timeout: int, limiter: AdaptiveLimiter):
+        self.url = url
+        self.client = ollama.AsyncClient(host=url, timeout=timeout)
+        self.limiter = limiter
+        self.in_flight = 0
+        self.latency: Optional[float] = None  # Media móvil exponencial (segundos)
+        self.failures = 0
+        self.quarantined_until = 0.0
+
+    def is_available(self, now: float) -> bool:
+        """Indica si el endpoint no está en cuarentena."""
+        return now >= self.quarantined_until
+
+    def score(self) -> float:
+        """Coste estimado de enviar una petición más a este endpoint."""
+        latency = self.latency if self.latency is not None else 0.0
+        return (self.in_flight + 1) * latency
+
+
+class OllamaEndpointPool:
+    """Reparte peticiones entre varios servidores de Ollama.
+
+    Cada endpoint tiene su propio AdaptiveLimiter (concurrencia por GPU, que se
+    ajusta sola ante timeouts y respuestas 5xx). La elección combina
+    round-robin con la latencia observada, y un circuit breaker pone en
+    cuarentena los endpoints que fallan repetidamente para que no bloqueen la cola.
+
+    Ejemplo:
+        >>> pool = OllamaEndpointPool(["http://gpu0:11434", "http://gpu1:11434"])
+        >>> async with pool.acquire() as endpoint:
+        ...     await endpoint.client.chat(model="mistral", messages=[...])
+    """
+
+    def __init__(
+        self,
+        hosts: Sequence[str],
+        timeout: int = 120,
+        min_concurrency: int = 1,
+        max_concurrency: int = 8,
+        initial_concurrency: int = 2,
+        failure_threshold: int = 3,
+        quarantine_seconds: float = 30.0,
+        latency_alpha: float = 0.3,
+    ):
+        """Inicializa el pool.
+
+        Args:
+            hosts: URLs de los servidores de Ollama
+            timeout: Timeout en segundos para las peticiones
+            min_concurrency: Concurrencia mínima por endpoint
+            max_concurrency: Concurrencia máxima por endpoint
+            initial_concurrency: Concurrencia inicial por endpoint
+            failure_threshold: Fallos consecutivos antes de poner un endpoint en cuarentena
+            quarantine_seconds: Duración de la cuarentena
+            latency_alpha: Peso de la última muestra en la media de latencia
+
+        Raises:
+            ImportError: Si ollama no está instalado
+            ValueError: Si no se indica ningún host
+        """
+        if ollama is None:
+            raise ImportError(
+                "ollama no está instalado. "
+                "Instala con: uv add ollama"
+            )
+        if not hosts:
+            raise ValueError("Se necesita al menos un host de Ollama")
+
+        self.endpoints = [
+            OllamaEndpoint(url, timeout, AdaptiveLimiter(min_concurrency, max_concurrency, initial_concurrency))
+            for url in hosts
+        ]
+        self.failure_threshold = failure_threshold
+        self.quarantine_seconds = quarantine_seconds
+        self.latency_alpha = latency_alpha
+        self._order = itertools.cycle(range(len(self.endpoints)))
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    def next_endpoint(self, exclude: Sequence[OllamaEndpoint] = ()) -> OllamaEndpoint:
+        """Elige el siguiente endpoint a usar.
+
+        Recorre los endpoints en orden round-robin y se queda con el disponible
+        de menor coste. Si todos están en cuarentena, devuelve el que sale antes
+        de ella (estado semiabierto del circuit breaker).
+
+        Args:
+            exclude: Endpoints que no deben elegirse (p. ej. ya fallidos en este intento)
+
+        Returns:
+            Endpoint elegido
+        """
+        now = time.monotonic()
+        start = next(self._order)
+        n = len(self.endpoints)
+        candidates = [self.endpoints[(start + i) % n] for i in range(n)]
+        candidates = [e for e in candidates if e not in exclude] or candidates
+
+        available = [e for e in candidates if e.is_available(now)]
+        if not available:
+            return min(candidates, key=lambda e: e.quarantined_until)
+
+        # min() es estable: a igual coste gana el orden round-robin
+        return min(available, key=lambda e: e.score())
+
+    @asynccontextmanager
+    async def acquire(self, exclude: Sequence[OllamaEndpoint] = ()) -> AsyncIterator[OllamaEndpoint]:
+        """Reserva un endpoint y registra el resultado de la petición.
+
+        Args:
+            exclude: Endpoints que no deben elegirse
+
+        Yields:
+            Endpoint reservado (respetando su límite de concurrencia)
+        """
+        endpoint = self.next_endpoint(exclude)
+        endpoint.in_flight += 1
+        try:
+            async with endpoint.limiter:
+                started = time.monotonic()
+                try:
+                    yield endpoint
+                except Exception as e:
+                    if not is_busy_error(e):
+                        self._record_failure(endpoint)
+                    raise
+                self._record_success(endpoint, time.monotonic() - started)
+        finally:
+            endpoint.in_flight -= 1
+
+    def describe(self) -> str:
+        """Resumen legible de la concurrencia actual de cada endpoint."""
+        return ", ".join(f"{e.url}={e.limiter.concurrency}" for e in self.endpoints)
+
+    def _record_success(self, endpoint: OllamaEndpoint, elapsed: float) -> None:
+        """Actualiza la latencia y cierra el circuito del endpoint."""
+        if endpoint.latency is None:
+            endpoint.latency = elapsed
+        else:
+            endpoint.latency += self.latency_alpha * (elapsed - endpoint.latency)
+        endpoint.failures = 0
+        endpoint.quarantined_until = 0.0
+
+    def _record_failure(self, endpoint: OllamaEndpoint) -> None:
+        """Cuenta un fallo y abre el circuito si se supera el umbral."""
+        endpoint.failures += 1
+        if endpoint.failures >= self.failure_threshold:
+            endpoint.quarantined_until = time.monotonic() + self.quarantine_seconds
+            print(f"\n⚠️  Advertencia: Ollama en {endpoint.url} en cuarentena "
+                  f"{self.quarantine_seconds:.0f}s tras {endpoint.failures} fallos")
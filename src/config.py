@@ -1,5 +1,6 @@
 """Configuración centralizada de la aplicación usando Pydantic Settings."""
 
+import functools
 import os
 from pathlib import Path
 from typing import Optional
@@ -13,23 +14,55 @@ class Settings(BaseSettings):
     1. Archivo .env
     2. Variables de entorno
     3. Valores por defecto
+
+    La instancia es inmutable; usar get_settings() para obtener la compartida.
     """
 
     model_config = SettingsConfigDict(
         env_file='.env',
         env_file_encoding='utf-8',
         case_sensitive=False,
-        env_prefix='PDF_ANALYZER_'
+        env_prefix='PDF_ANALYZER_',
+        extra='ignore',
+        frozen=True
     )
 
     # Configuración de Ollama
     ollama_host: str = "http://localhost:11434"
     ollama_model: str = "llama3:8b"
     ollama_timeout: int = 120
+    ollama_initial_concurrency: int = 2  # Peticiones simultáneas iniciales por servidor
+    ollama_max_concurrency: int = 8  # Tope del control adaptativo (AIMD) por servidor
+    ollama_max_input_tokens: int = 1500  # Tokens por petición al LLM (páginas más largas: varias ventanas)
+    ollama_num_ctx: int = 4096
+    ollama_num_predict: int = 512
+    ollama_keep_alive: str = "1h"
+    min_ollama_chars: int = 200  # Páginas más cortas no se envían al LLM
+    min_alpha_ratio: float = 0.5  # Proporción mínima de letras para enviar al LLM
+    min_clean_ollama_chars: int = 500  # Páginas más cortas sin errores de LanguageTool no van al LLM
+
+    # Configuración de extracción de PDF ("auto", "pymupdf", "pdfium" o "pdfminer")
+    pdf_backend: str = "auto"
+    pdf_extract_workers: int = 1  # Procesos de extracción (>1 reparte tramos de páginas)
 
     # Configuración de LanguageTool
     languagetool_language: str = "es"
     languagetool_cache_dir: Path = Path.home() / ".cache" / "language_tool_python"
+    languagetool_batch_size: int = 20  # Máximo de páginas por petición
+    languagetool_workers: int = 1  # Procesos con su propio servidor de LanguageTool
+    languagetool_remote_url: Optional[str] = None  # Servidor ya en marcha (p. ej. http://localhost:8081)
+    languagetool_shared_server: bool = False  # Servidor local persistente compartido entre ejecuciones
+    languagetool_port: int = 8081  # Puerto del servidor compartido
+
+    # Caché persistente de resultados
+    cache_enabled: bool = True
+    cache_dir: Path = Path.home() / ".cache" / "pdf_text_refiner"
+    ollama_semantic_cache: bool = False  # Requiere sentence-transformers
+    ollama_semantic_threshold: float = 0.95
+
+    # Configuración del pipeline asíncrono
+    pipeline_workers: int = 4
+    pipeline_queue_size: int = 4
 
     # Configuración de debug
     debug_enabled: bool = False
@@ -40,5 +73,11 @@ class Settings(BaseSettings):
         return cls()
 
 
+@functools.lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Devuelve la configuración, leyendo el entorno y el .env una sola vez por proceso."""
+    return Settings()
+
+
 # Instancia global de configuración
-settings = Settings()
+settings = get_settings()
@@ -1,9 +1,42 @@
 """Formateadores de salida para los resultados del análisis."""
 
-from typing import Dict, List
+from io import StringIO
+from typing import Callable, Dict, List
 
+from src.checkers.errors import TextError
 
-def format_output_hybrid(page_errors: Dict[int, Dict[str, List[Dict]]]) -> str:
+# Plantillas del informe (formato %): cada error se escribe con una sola llamada
+_SEPARATOR = "=" * 80
+_PAGE_HEADER = _SEPARATOR + "\nPágina %d\n" + _SEPARATOR
+_LT_HEADER = "\n\n📝 Errores detectados por LanguageTool (%d):"
+_LT_ERROR = '\n  ❌ "%s"\n     Tipo: %s\n     Posición: %s\n     Sugerencia: %s\n'
+_LLM_HEADER = "\n\n🤖 Errores de redacción detectados por LLM (%d):"
+_LLM_ERROR = '\n  ❌ "%s"\n     Tipo: %s\n     Sugerencia: %s'
+_LLM_REASON = "\n     Razón: %s"
+
+
+def drop_duplicate_llm_errors(
+    lt_errors: List[TextError],
+    ollama_errors: List[TextError],
+) -> List[TextError]:
+    """Descarta los errores del LLM cuyo texto ya señaló LanguageTool en la misma página.
+
+    La comparación ignora mayúsculas y espacios en los extremos.
+
+    Args:
+        lt_errors: Errores de LanguageTool de la página
+        ollama_errors: Errores de Ollama de la página
+
+    Returns:
+        Errores de Ollama no cubiertos por LanguageTool
+    """
+    if not lt_errors or not ollama_errors:
+        return ollama_errors
+    lt_words = {error.word.strip().lower() for error in lt_errors}
+    return [error for error in ollama_errors if error.word.strip().lower() not in lt_words]
+
+
+def format_output_hybrid(page_errors: Dict[int, Dict[str, List[TextError]]]) -> str:
     """Formatea los errores encontrados por ambos métodos (LanguageTool + Ollama).
 
     Args:
@@ -16,53 +49,164 @@ def format_output_hybrid(page_errors: Dict[int, Dict[str, List[Dict]]]) -> str:
             }
 
     Returns:
-        String formateado con todos los errores
+        String formateado con todos los errores (sin los errores del LLM que
+        repiten uno de LanguageTool, ver drop_duplicate_llm_errors())
 
     Ejemplo:
         >>> page_errors = {
         ...     0: {
-        ...         'languagetool': [{'word': 'eror', 'suggestions': ['error'], ...}],
+        ...         'languagetool': [TextError('eror', 3, ['error'], 'Un eror.', 'TYPOS')],
         ...         'ollama': []
         ...     }
         ... }
         >>> output = format_output_hybrid(page_errors)
     """
-    output = []
+    buf = StringIO()
+    write = buf.write
 
     for page_num in sorted(page_errors.keys()):
         page_data = page_errors[page_num]
         lt_errors = page_data.get('languagetool', [])
-        ollama_errors = page_data.get('ollama', [])
-
-        if lt_errors or ollama_errors:
-            output.append(f"{'=' * 80}")
-            output.append(f"Página {page_num + 1}")
-            output.append(f"{'=' * 80}")
-
-            if lt_errors:
-                output.append(f"\n📝 Errores detectados por LanguageTool ({len(lt_errors)}):")
-                for error in lt_errors:
-                    suggestions = "|".join(error['suggestions']) if error['suggestions'] else "sin sugerencias"
-                    error_type = error.get('error_type', 'Desconocido')
-                    output.append(f"  ❌ \"{error['word']}\"")
-                    output.append(f"     Tipo: {error_type}")
-                    output.append(f"     Posición: {error['offset']}")
-                    output.append(f"     Sugerencia: {suggestions}")
-                    output.append("")
-
-            if ollama_errors:
-                output.append(f"\n🤖 Errores de redacción detectados por LLM ({len(ollama_errors)}):")
-                for error in ollama_errors:
-                    suggestions = " | ".join(error['suggestions']) if error['suggestions'] else "revisar manualmente"
-                    error_type = error.get('error_type', 'Desconocido')
-                    reason = error.get('reason', '')
-                    output.append(f"  ❌ \"{error['word']}\"")
-                    output.append(f"     Tipo: {error_type}")
-                    output.append(f"     Sugerencia: {suggestions}")
-                    if reason:
-                        output.append(f"     Razón: {reason}")
-                    output.append("")
-
-            output.append("")  # Línea en blanco entre páginas
-
-    return "\n".join(output)
+        ollama_errors = drop_duplicate_llm_errors(lt_errors, page_data.get('ollama', []))
+        if not lt_errors and not ollama_errors:
+            continue
+        # Bloques separados por "\n"
+        if buf.tell():
+            write("\n")
+        write_page_block(write, page_num, lt_errors, ollama_errors)
+
+    return buf.getvalue()
+
+
+def format_page_block(page_num: int, lt_errors: List[TextError], ollama_errors: List[TextError]) -> str:
+    """Formatea los errores de una sola página (un bloque de format_output_hybrid).
+
+    Los bloques de varias páginas se unen con "\n"; así el resultado es
+    idéntico al de format_output_hybrid().
+
+    Args:
+        page_num: Número de página (0-indexed)
+        lt_errors: Errores de LanguageTool de la página
+        ollama_errors: Errores de Ollama de la página
+
+    Returns:
+        Bloque formateado, o cadena vacía si la página no tiene errores
+    """
+    if not lt_errors and not ollama_errors:
+        return ""
+
+    buf = StringIO()
+    write_page_block(buf.write, page_num, lt_errors, ollama_errors)
+    return buf.getvalue()
+
+
+def write_page_block(
+    write: Callable[[str], object],
+    page_num: int,
+    lt_errors: List[TextError],
+    ollama_errors: List[TextError],
+) -> None:
+    """Escribe el bloque de format_page_block() directamente con write (sin construir el string).
+
+    Args:
+        write: Función de escritura (p. ej. file.write o StringIO.write)
+        page_num: Número de página (0-indexed)
+        lt_errors: Errores de LanguageTool de la página (no vacíos junto con ollama_errors)
+        ollama_errors: Errores de Ollama de la página
+    """
+    write(_PAGE_HEADER % (page_num + 1))
+
+    if lt_errors:
+        write(_LT_HEADER % len(lt_errors))
+        for error in lt_errors:
+            write(_LT_ERROR % (
+                error.word,
+                error.error_type,
+                error.offset,
+                "|".join(error.suggestions) or "sin sugerencias",
+            ))
+
+    if ollama_errors:
+        write(_LLM_HEADER % len(ollama_errors))
+        for error in ollama_errors:
+            write(_LLM_ERROR % (
+                error.word,
+                error.error_type,
+                " | ".join(error.suggestions) or "revisar manualmente",
+            ))
+            reason = error.reason
+            if reason:
+                write(_LLM_REASON % reason)
+            write("\n")
+
+    write("\n")  # Línea en blanco entre páginas
+
+
+class HybridReportWriter:
+    """Escribe el informe de format_output_hybrid() página a página.
+
+    Cada página se escribe en cuanto se termina de analizar (en orden), de
+    modo que un informe interrumpido conserva las páginas ya procesadas y no
+    hace falta tener todos los errores en memoria.
+
+    Ejemplo:
+        >>> with HybridReportWriter("errores.txt") as report:
+        ...     report.write_page(0, [...], [])
+    """
+
+    def __init__(self, path: str, buffer_size: int = 1 << 20):
+        """Abre (y trunca) el archivo de salida.
+
+        Args:
+            path: Ruta del archivo de salida
+            buffer_size: Tamaño del buffer de escritura en bytes
+
+        Raises:
+            OSError: Si el archivo no puede abrirse
+        """
+        self._file = open(path, 'w', encoding='utf-8', buffering=buffer_size)
+        self.total_lt_errors = 0
+        self.total_ollama_errors = 0
+        self.pages_with_errors = 0
+
+    def write_page(self, page_num: int, lt_errors: List[TextError], ollama_errors: List[TextError]) -> None:
+        """Escribe el bloque de una página (no escribe nada si no tiene errores).
+
+        Los errores del LLM que repiten uno de LanguageTool no se escriben ni
+        se cuentan en los totales.
+
+        Args:
+            page_num: Número de página (0-indexed)
+            lt_errors: Errores de LanguageTool de la página
+            ollama_errors: Errores de Ollama de la página
+        """
+        ollama_errors = drop_duplicate_llm_errors(lt_errors, ollama_errors)
+        if not lt_errors and not ollama_errors:
+            return
+
+        # Separador "\n" entre bloques, igual que format_output_hybrid()
+        if self.pages_with_errors:
+            self._file.write("\n")
+        write_page_block(self._file.write, page_num, lt_errors, ollama_errors)
+        self.total_lt_errors += len(lt_errors)
+        self.total_ollama_errors += len(ollama_errors)
+        self.pages_with_errors += 1
+
+    def close(self, finished: bool = True) -> None:
+        """Vacía el buffer y cierra el archivo.
+
+        Args:
+            finished: False si el análisis se interrumpió (no se añade el
+                mensaje de "sin errores" a un informe parcial)
+        """
+        if self._file.closed:
+            return
+        if finished and not self.pages_with_errors:
+            self._file.write("No se encontraron errores.\n")
+        self._file.close()
+
+    def __enter__(self) -> "HybridReportWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(finished=exc_type is None)
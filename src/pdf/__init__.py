@@ -1,11 +1,58 @@
 """Módulo de extracción de texto desde PDFs."""
 
-__all__ = ["PDFExtractor"]
+__all__ = ["PDFExtractor", "PdfiumExtractor", "PyMuPDFExtractor", "create_extractor", "iter_pages_parallel"]
+
+# Backends disponibles, en orden de preferencia para "auto"
+BACKENDS = ("pymupdf", "pdfium", "pdfminer")
+
+
+def create_extractor(pdf_path: str, backend: str = "auto"):
+    """Crea el extractor de texto para el backend indicado.
+
+    Args:
+        pdf_path: Ruta al archivo PDF
+        backend: "pymupdf" (PyMuPDF), "pdfium" (pypdfium2), "pdfminer"
+            (pdfminer.six) o "auto" para usar el primero instalado en ese orden
+
+    Returns:
+        Instancia de PyMuPDFExtractor, PdfiumExtractor o PDFExtractor
+
+    Raises:
+        ValueError: Si el backend no es válido
+        ImportError: Si el backend pedido no está instalado
+    """
+    if backend not in BACKENDS + ("auto",):
+        raise ValueError(f"Backend de PDF no válido: {backend!r} (opciones: auto, {', '.join(BACKENDS)})")
+
+    if backend in ("auto", "pymupdf"):
+        from src.pdf.extractor_pymupdf import PyMuPDFExtractor, pymupdf
+        if pymupdf is not None or backend == "pymupdf":
+            return PyMuPDFExtractor(pdf_path)
+
+    if backend in ("auto", "pdfium"):
+        from src.pdf.extractor_pdfium import PdfiumExtractor, pdfium
+        if pdfium is not None or backend == "pdfium":
+            return PdfiumExtractor(pdf_path)
+
+    from src.pdf.extractor import PDFExtractor
+    return PDFExtractor(pdf_path)
 
 
 def __getattr__(name):
-    """Lazy import para evitar importaciones eagerly."""
+    """Lazy import para evitar importaciones eagerly.
+
+    La clase importada se guarda en el módulo, así que los accesos siguientes
+    ya no pasan por __getattr__.
+    """
     if name == "PDFExtractor":
-        from src.pdf.extractor import PDFExtractor
-        return PDFExtractor
-    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        from src.pdf.extractor import PDFExtractor as value
+    elif name == "PyMuPDFExtractor":
+        from src.pdf.extractor_pymupdf import PyMuPDFExtractor as value
+    elif name == "PdfiumExtractor":
+        from src.pdf.extractor_pdfium import PdfiumExtractor as value
+    elif name == "iter_pages_parallel":
+        from src.pdf.parallel import iter_pages_parallel as value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
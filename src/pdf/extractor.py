@@ -1,19 +1,25 @@
 """Extractor de texto desde archivos PDF usando PDFMiner."""
 
 from io import StringIO
-from typing import Optional
+from typing import Iterator, Optional, Tuple
 
 try:
     from pdfminer.converter import TextConverter
     from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
     from pdfminer.pdfpage import PDFPage
     from pdfminer.layout import LAParams
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdftypes import resolve1
 except ImportError:
     TextConverter = None  # type: ignore
     PDFResourceManager = None  # type: ignore
     PDFPageInterpreter = None  # type: ignore
     PDFPage = None  # type: ignore
     LAParams = None  # type: ignore
+    PDFDocument = None  # type: ignore
+    PDFParser = None  # type: ignore
+    resolve1 = None  # type: ignore
 
 
 class PDFExtractor:
@@ -23,6 +29,8 @@ class PDFExtractor:
         >>> extractor = PDFExtractor("documento.pdf")
         >>> total_pages = extractor.get_page_count()
         >>> text = extractor.extract_page_text(0)
+        >>> for page_num, text in extractor.iter_pages(0, 10):
+        ...     print(page_num, len(text))
     """
 
     def __init__(self, pdf_path: str):
@@ -44,6 +52,11 @@ class PDFExtractor:
         self.pdf_path = pdf_path
         self._validate_pdf()
 
+        # Compartidos entre llamadas: el gestor de recursos cachea las fuentes ya parseadas
+        self._resource_manager = PDFResourceManager()
+        self._laparams = LAParams()
+        self._page_count: Optional[int] = None
+
     def _validate_pdf(self) -> None:
         """Valida que el archivo PDF exista.
 
@@ -59,54 +72,115 @@ class PDFExtractor:
     def get_page_count(self) -> int:
         """Obtiene el número total de páginas en el PDF.
 
+        Lee /Count del árbol de páginas del catálogo sin recorrer las páginas;
+        solo si falta o no es válido se cuentan recorriendo el árbol. El
+        resultado se guarda para las llamadas siguientes.
+
         Returns:
             Número total de páginas
 
         Raises:
             Exception: Si el PDF no puede ser leído
         """
+        if self._page_count is not None:
+            return self._page_count
+
         try:
             with open(self.pdf_path, 'rb') as pdf_file:
-                return len(list(PDFPage.get_pages(pdf_file)))
+                document = PDFDocument(PDFParser(pdf_file))
+                count = resolve1(resolve1(document.catalog['Pages']).get('Count'))
+                if not isinstance(count, int) or count < 0:
+                    count = sum(1 for _ in PDFPage.create_pages(document))
         except Exception as e:
             raise Exception(f"Error leyendo PDF: {str(e)}")
 
+        self._page_count = count
+        return count
+
     def extract_page_text(self, page_number: int) -> str:
         """Extrae el texto limpio de una página específica del PDF.
 
+        Envoltorio de iter_pages() para una sola página; para recorrer varias
+        páginas usa iter_pages() directamente (una sola pasada por el PDF).
+
         Args:
             page_number: Número de página (0-indexed)
 
         Returns:
-            Texto extraído de la página como string. Si hay error, retorna string vacío.
+            Texto extraído de la página como string. Si la página no existe, retorna string vacío.
 
         Raises:
-            Exception: Si el PDF no puede ser leído o la página no existe
+            Exception: Si el PDF no puede ser leído o la página no puede procesarse
+        """
+        try:
+            for _, text in self._process_pages(page_number, page_number + 1, skip_errors=False):
+                return text
+        except Exception as e:
+            raise Exception(f"Error extrayendo texto de página {page_number + 1}: {str(e)}")
+        return ""
+
+    def iter_pages(self, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """Itera las páginas del PDF abriéndolo y recorriéndolo una sola vez.
+
+        Reutiliza el mismo TextConverter para todas las páginas (y el
+        PDFResourceManager del extractor), vaciando el buffer entre una y otra.
+
+        Si una página no se puede procesar se avisa y se devuelve texto vacío
+        para ella, sin interrumpir la iteración.
+
+        Args:
+            start: Primera página (0-indexed, inclusive)
+            end: Última página (0-indexed, exclusiva). None para llegar al final
+
+        Yields:
+            Tuplas (número de página 0-indexed, texto extraído)
+
+        Raises:
+            Exception: Si el PDF no puede ser leído
+        """
+        try:
+            yield from self._process_pages(start, end, skip_errors=True)
+        except Exception as e:
+            raise Exception(f"Error leyendo PDF: {str(e)}")
+
+    def _process_pages(self, start: int, end: Optional[int], skip_errors: bool) -> Iterator[Tuple[int, str]]:
+        """Recorre el PDF una vez y extrae el texto de las páginas [start, end).
+
+        Args:
+            start: Primera página (0-indexed, inclusive)
+            end: Última página (0-indexed, exclusiva). None para llegar al final
+            skip_errors: True para avisar y devolver texto vacío en las páginas
+                que fallan; False para propagar el error
+
+        Yields:
+            Tuplas (número de página 0-indexed, texto extraído)
         """
-        resource_manager = PDFResourceManager()
         output_string = StringIO()
-        laparams = LAParams()
-        device = TextConverter(resource_manager, output_string, laparams=laparams)
-        interpreter = PDFPageInterpreter(resource_manager, device)
+        device = TextConverter(self._resource_manager, output_string, laparams=self._laparams)
+        interpreter = PDFPageInterpreter(self._resource_manager, device)
 
         try:
             with open(self.pdf_path, 'rb') as pdf_file:
-                # Iterar sobre las páginas hasta llegar a la deseada
-                for current_page_num, page in enumerate(PDFPage.get_pages(pdf_file)):
-                    if current_page_num == page_number:
-                        interpreter.process_page(page)
-                        text = output_string.getvalue()
-                        device.close()
-                        output_string.close()
-                        return text.strip()
-                    elif current_page_num > page_number:
+                for page_num, page in enumerate(PDFPage.get_pages(pdf_file)):
+                    if page_num < start:
+                        continue
+                    if end is not None and page_num >= end:
                         break
 
-                device.close()
-                output_string.close()
-                return ""
-
-        except Exception as e:
+                    try:
+                        interpreter.process_page(page)
+                        text = output_string.getvalue().strip()
+                    except Exception as e:
+                        if not skip_errors:
+                            raise
+                        print(f"\n⚠️  Advertencia: No se pudo extraer texto de página {page_num + 1}: {str(e)}")
+                        text = ""
+
+                    # Vaciar el buffer para la siguiente página
+                    output_string.seek(0)
+                    output_string.truncate(0)
+
+                    yield page_num, text
+        finally:
             device.close()
             output_string.close()
-            raise Exception(f"Error extrayendo texto de página {page_number + 1}: {str(e)}")
@@ -0,0 +1,106 @@
+"""Extractor de texto desde archivos PDF usando PDFium (pypdfium2)."""
+
+from typing import Iterator, Optional, Tuple
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None  # type: ignore
+
+
+class PdfiumExtractor:
+    """Extractor de texto basado en PDFium (C++), mucho más rápido que pdfminer.six.
+
+    Expone la misma interfaz que PDFExtractor. El documento se abre una sola
+    vez y se mantiene abierto; PDFium no es thread-safe, así que no debe
+    usarse desde varios hilos a la vez.
+
+    Ejemplo:
+        >>> extractor = PdfiumExtractor("documento.pdf")
+        >>> total_pages = extractor.get_page_count()
+        >>> text = extractor.extract_page_text(0)
+    """
+
+    def __init__(self, pdf_path: str):
+        """Inicializa el extractor.
+
+        Args:
+            pdf_path: Ruta al archivo PDF
+
+        Raises:
+            FileNotFoundError: Si el PDF no existe
+            ImportError: Si pypdfium2 no está instalado
+        """
+        if pdfium is None:
+            raise ImportError(
+                "pypdfium2 no está instalado. "
+                "Instala con: uv add pypdfium2"
+            )
+
+        self.pdf_path = pdf_path
+        try:
+            self._doc = pdfium.PdfDocument(pdf_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"PDF no encontrado: {self.pdf_path}")
+
+    def get_page_count(self) -> int:
+        """Obtiene el número total de páginas en el PDF.
+
+        Returns:
+            Número total de páginas
+        """
+        return len(self._doc)
+
+    def extract_page_text(self, page_number: int) -> str:
+        """Extrae el texto limpio de una página específica del PDF.
+
+        Args:
+            page_number: Número de página (0-indexed)
+
+        Returns:
+            Texto extraído de la página como string
+
+        Raises:
+            Exception: Si la página no puede ser leída
+        """
+        try:
+            page = self._doc[page_number]
+            try:
+                textpage = page.get_textpage()
+                try:
+                    text = textpage.get_text_range()
+                finally:
+                    textpage.close()
+            finally:
+                page.close()
+        except Exception as e:
+            raise Exception(f"Error extrayendo texto de página {page_number + 1}: {str(e)}")
+
+        # PDFium separa las líneas con CRLF
+        return text.replace('\r\n', '\n').strip()
+
+    def iter_pages(self, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """Itera las páginas del PDF en orden.
+
+        Si una página no se puede procesar se avisa y se devuelve texto vacío
+        para ella, sin interrumpir la iteración.
+
+        Args:
+            start: Primera página (0-indexed, inclusive)
+            end: Última página (0-indexed, exclusiva). None para llegar al final
+
+        Yields:
+            Tuplas (número de página 0-indexed, texto extraído)
+        """
+        end = len(self._doc) if end is None else min(end, len(self._doc))
+        for page_num in range(start, end):
+            try:
+                text = self.extract_page_text(page_num)
+            except Exception as e:
+                print(f"\n⚠️  Advertencia: No se pudo extraer texto de página {page_num + 1}: {str(e)}")
+                text = ""
+            yield page_num, text
+
+    def close(self) -> None:
+        """Cierra el documento PDF."""
+        self._doc.close()
@@ -0,0 +1,79 @@
+"""Extracción de texto en paralelo repartiendo tramos de páginas entre procesos."""
+
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Tuple
+
+# Páginas contiguas por tarea: cada proceso recorre su tramo en una sola pasada
+CHUNK_PAGES = 8
+
+# Extractor propio de cada proceso del pool
+_worker_extractor = None
+
+
+def _init_worker(pdf_path: str, backend: str) -> None:
+    """Abre el PDF una vez por proceso."""
+    global _worker_extractor
+    from src.pdf import create_extractor
+    _worker_extractor = create_extractor(pdf_path, backend)
+
+
+def _extract_chunk(start: int, end: int) -> List[Tuple[int, str]]:
+    return list(_worker_extractor.iter_pages(start, end))
+
+
+def iter_pages_parallel(
+    pdf_path: str,
+    start: int,
+    end: int,
+    backend: str = "auto",
+    workers: int = 2,
+    chunk_pages: int = CHUNK_PAGES,
+) -> Iterator[Tuple[int, str]]:
+    """Itera las páginas del PDF extrayéndolas en varios procesos.
+
+    El rango se divide en tramos contiguos de chunk_pages páginas que se
+    reparten entre los procesos (contexto spawn, cada uno con su propio
+    extractor). Las páginas se devuelven en orden, y como mucho hay
+    2 × workers tramos en curso para no adelantarse demasiado al análisis.
+    Misma interfaz que iter_pages() de los extractores.
+
+    Args:
+        pdf_path: Ruta al archivo PDF
+        start: Primera página (0-indexed, inclusive)
+        end: Última página (0-indexed, exclusiva)
+        backend: Backend de extracción (ver create_extractor())
+        workers: Número de procesos
+        chunk_pages: Páginas por tramo
+
+    Yields:
+        Tuplas (número de página 0-indexed, texto extraído)
+    """
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(pdf_path, backend),
+    )
+    chunks = iter(range(start, end, chunk_pages))
+    pending: deque = deque()
+
+    def submit_next() -> bool:
+        chunk_start = next(chunks, None)
+        if chunk_start is None:
+            return False
+        pending.append(executor.submit(_extract_chunk, chunk_start, min(chunk_start + chunk_pages, end)))
+        return True
+
+    try:
+        for _ in range(2 * workers):
+            if not submit_next():
+                break
+
+        while pending:
+            pages = pending.popleft().result()
+            submit_next()
+            yield from pages
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,366 @@
+"""Pipeline asíncrono que solapa extracción, LanguageTool y Ollama por página."""
+
+import asyncio
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext, suppress
+from dataclasses import replace
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.checkers.base import Checker
+from src.checkers.errors import TextError
+from src.utils import DebugWriter
+
+# Resultado de una página: (página, errores de LanguageTool, errores de Ollama)
+PageResult = Tuple[int, List[TextError], List[TextError]]
+
+CHECKERS = ('languagetool', 'ollama')
+
+# Cada cuántas páginas se muestra la concurrencia de Ollama en modo debug
+CONCURRENCY_LOG_INTERVAL = 20
+
+
+class PageExtractionError(RuntimeError):
+    """El iterador de páginas falló: el análisis quedó incompleto."""
+
+
+def needs_llm_review(text: str, min_chars: int = 200, min_alpha_ratio: float = 0.5) -> bool:
+    """Decide si merece la pena enviar una página a Ollama.
+
+    Se descartan las páginas con poco texto (en blanco, figuras, portadillas)
+    y las que son mayoritariamente no alfabéticas (índices, tablas, números
+    de página), donde el LLM apenas aporta y cada llamada cuesta segundos.
+
+    Args:
+        text: Texto de la página
+        min_chars: Mínimo de caracteres (sin espacios en los extremos)
+        min_alpha_ratio: Proporción mínima de caracteres alfabéticos
+
+    Returns:
+        True si la página debe analizarse con Ollama
+    """
+    text = text.strip()
+    if len(text) < min_chars:
+        return False
+    alpha = sum(map(str.isalpha, text))
+    return alpha / len(text) >= min_alpha_ratio
+
+
+async def iter_page_results(
+    pages: Iterator[Tuple[int, str]],
+    lt_checker: Checker,
+    ollama_checker,
+    debug_dir: Optional[str] = None,
+    on_page_done: Optional[Callable[[], None]] = None,
+    workers: int = 4,
+    queue_size: int = 4,
+    lt_batch_size: int = 20,
+    lt_workers: int = 1,
+    min_ollama_chars: int = 200,
+    min_alpha_ratio: float = 0.5,
+    min_clean_ollama_chars: int = 500,
+) -> AsyncIterator[PageResult]:
+    """Analiza un rango de páginas solapando las tres etapas y entrega los resultados en orden.
+
+    Un productor avanza el iterador de páginas (p. ej. PDFExtractor.iter_pages())
+    en un hilo y reparte cada página a dos etapas independientes:
+
+    - LanguageTool: lt_workers tareas que agrupan las páginas pendientes
+      (hasta lt_batch_size) en una sola petición con check_batch(). Mientras
+      una petición está en curso se acumulan páginas, así que los lotes crecen
+      solos cuando LanguageTool es el cuello de botella. Con un
+      LanguageToolPool, cada tarea ocupa un proceso del pool.
+    - Ollama: varios consumidores que llaman a check_async(). La cola acotada
+      aplica contrapresión sobre la extracción; la concurrencia hacia Ollama
+      la limita el pool de endpoints del propio OllamaChecker. Las páginas que
+      no pasan needs_llm_review() no se envían a Ollama. Las páginas cortas
+      (menos de min_clean_ollama_chars) esperan al resultado de LanguageTool
+      y solo van a Ollama si este encontró algún error.
+
+    Las páginas cuyo texto ya apareció antes en el documento (cabeceras,
+    separadores, páginas repetidas) no se vuelven a analizar: reutilizan una
+    copia del resultado de la primera aparición en ambas etapas, esperando a
+    que termine si aún está en curso.
+
+    Una página se da por terminada cuando ambas etapas han devuelto su
+    resultado, y se entrega en cuanto ella y todas las anteriores lo están (p.
+    ej. para escribir el informe en streaming); no se construye el diccionario
+    de errores del documento. Lo único que crece con el documento es la
+    memoria de deduplicación: el resultado de cada etapa por cada texto
+    distinto se conserva hasta el final, porque cualquier página posterior
+    puede repetirlo.
+
+    Args:
+        pages: Iterador de tuplas (número de página 0-indexed, texto)
+        lt_checker: LanguageToolChecker (o LanguageToolPool) ya inicializado; se usa su check_batch()
+        ollama_checker: Instancia de OllamaChecker
+        debug_dir: Directorio de debug (None si no se usa)
+        on_page_done: Callback invocado al terminar cada página (barra de progreso)
+        workers: Número de consumidores concurrentes de Ollama
+        queue_size: Tamaño máximo de la cola de páginas pendientes de Ollama
+        lt_batch_size: Máximo de páginas por petición a LanguageTool
+        lt_workers: Número de lotes de LanguageTool verificándose a la vez
+        min_ollama_chars: Mínimo de caracteres para enviar una página a Ollama
+        min_alpha_ratio: Proporción mínima de letras para enviar una página a Ollama
+        min_clean_ollama_chars: Mínimo de caracteres para enviar a Ollama una
+            página sin errores de LanguageTool (0 = no esperar a LanguageTool)
+
+    Si el iterador de páginas lanza una excepción, se terminan de analizar y
+    entregar las páginas ya leídas y después se lanza PageExtractionError.
+
+    Yields:
+        Tuplas (página, errores de LanguageTool, errores de Ollama) en orden de
+        página, también para las páginas sin errores
+
+    Raises:
+        PageExtractionError: Si la extracción de páginas falló (el error
+            original queda en __cause__)
+    """
+    loop = asyncio.get_running_loop()
+    ollama_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    lt_queue: asyncio.Queue = asyncio.Queue()
+    # Resultados listos para entregar, en orden de página (None al terminar)
+    ready_queue: asyncio.Queue = asyncio.Queue()
+    partial: Dict[int, Dict[str, List[TextError]]] = {}
+    # Páginas en orden de lectura y resultados terminados pendientes de entregar
+    order: deque = deque()
+    completed: Dict[int, PageResult] = {}
+    # Resultado (futuro) de cada etapa por sha1 del texto, para páginas repetidas
+    memo: Dict[str, Dict[bytes, asyncio.Future]] = {name: {} for name in CHECKERS}
+    reuse_tasks: List[asyncio.Task] = []
+    # Páginas cortas que esperan al resultado de LanguageTool para decidir si van a Ollama
+    deferred: Dict[int, str] = {}
+    ollama_done = 0
+    extraction_error: Optional[Exception] = None
+    debug_writer = DebugWriter(debug_dir) if debug_dir else None
+
+    def page_done(page_num: int, lt_errors: List[TextError], ollama_errors: List[TextError]) -> None:
+        completed[page_num] = (page_num, lt_errors, ollama_errors)
+        # Entregar en orden todas las páginas consecutivas ya terminadas
+        while order and order[0] in completed:
+            ready_queue.put_nowait(completed.pop(order.popleft()))
+
+        if on_page_done is not None:
+            on_page_done()
+
+    def record(page_num: int, checker: str, errors: List[TextError]) -> None:
+        """Guarda el resultado de una etapa y cierra la página si ya están ambas."""
+        results = partial.setdefault(page_num, {})
+        results[checker] = errors
+        if len(results) < len(CHECKERS):
+            return
+
+        del partial[page_num]
+        page_done(page_num, results['languagetool'], results['ollama'])
+
+    def memoize(checker: str, digest: bytes, page_num: int) -> bool:
+        """Registra la primera aparición de un texto o reutiliza su resultado.
+
+        Returns:
+            True si el texto es nuevo y la página debe analizarse
+        """
+        future = memo[checker].get(digest)
+        if future is None:
+            memo[checker][digest] = loop.create_future()
+            return True
+
+        async def reuse() -> None:
+            errors = await future
+            record(page_num, checker, [replace(error) for error in errors])
+
+        reuse_tasks.append(loop.create_task(reuse()))
+        return False
+
+    def resolve(checker: str, digest: bytes, errors: List[TextError]) -> None:
+        """Publica el resultado de un texto para sus repeticiones."""
+        memo[checker][digest].set_result(errors)
+
+    async def produce(executor: ThreadPoolExecutor) -> None:
+        nonlocal extraction_error
+        try:
+            while True:
+                # La extracción (CPU) se ejecuta en un hilo, página a página
+                try:
+                    item = await loop.run_in_executor(executor, next, pages, None)
+                except Exception as e:
+                    # Terminar las páginas ya leídas y propagar el error al final
+                    extraction_error = e
+                    break
+                if item is None:
+                    break
+
+                page_num, text = item
+                order.append(page_num)
+                if debug_writer is not None:
+                    debug_writer.add(text, page_num)
+
+                if not text.strip():
+                    page_done(page_num, [], [])
+                    continue
+
+                # Páginas repetidas: cada etapa analiza el texto una sola vez
+                digest = hashlib.sha1(text.encode('utf-8')).digest()
+                if memoize('languagetool', digest, page_num):
+                    lt_queue.put_nowait((page_num, text, digest))
+
+                if not needs_llm_review(text, min_ollama_chars, min_alpha_ratio):
+                    record(page_num, 'ollama', [])
+                elif memoize('ollama', digest, page_num):
+                    if len(text.strip()) < min_clean_ollama_chars:
+                        deferred[page_num] = text
+                    else:
+                        await ollama_queue.put((page_num, text, digest))
+        finally:
+            for _ in range(lt_workers):
+                lt_queue.put_nowait(None)
+
+    async def check_languagetool(executor: ThreadPoolExecutor) -> None:
+        finished = False
+        while not finished:
+            item = await lt_queue.get()
+            if item is None:
+                return
+
+            # Agrupar las páginas que ya estén esperando
+            batch = [item]
+            while len(batch) < lt_batch_size and not lt_queue.empty():
+                item = lt_queue.get_nowait()
+                if item is None:
+                    finished = True
+                    break
+                batch.append(item)
+
+            pages_batch = [(page_num, text) for page_num, text, _ in batch]
+            try:
+                results = await loop.run_in_executor(executor, lt_checker.check_batch, pages_batch)
+            except Exception as e:
+                print(f"\n⚠️  Error en LanguageTool páginas {batch[0][0] + 1}-{batch[-1][0] + 1}: {str(e)}")
+                results = {}
+
+            for page_num, text, digest in batch:
+                # check_batch() omite las páginas cuya petición falló (o todas,
+                # si lanzó una excepción): None = sin resultado de LanguageTool
+                errors = results.get(page_num)
+                resolve('languagetool', digest, errors or [])
+                record(page_num, 'languagetool', errors or [])
+
+                if deferred.pop(page_num, None) is None:
+                    continue
+                # Página corta: solo va al LLM si LanguageTool encontró errores o
+                # no pudo verificarla
+                if errors == []:
+                    resolve('ollama', digest, [])
+                    record(page_num, 'ollama', [])
+                else:
+                    await ollama_queue.put((page_num, text, digest))
+
+    async def check_ollama() -> None:
+        nonlocal ollama_done
+        while True:
+            item = await ollama_queue.get()
+            if item is None:
+                return
+
+            page_num, text, digest = item
+            try:
+                errors = await ollama_checker.check_async(text, page_num)
+            except Exception as e:
+                print(f"\n⚠️  Error en página {page_num + 1}: {str(e)}")
+                errors = []
+            resolve('ollama', digest, errors)
+            record(page_num, 'ollama', errors)
+
+            ollama_done += 1
+            if debug_dir and ollama_done % CONCURRENCY_LOG_INTERVAL == 0:
+                print(f"\n🔧 Concurrencia Ollama: {ollama_checker.describe_concurrency()}")
+
+    async def feed_ollama(executor: ThreadPoolExecutor) -> None:
+        # La cola de Ollama se cierra cuando ya no pueden llegar páginas: del
+        # productor o de LanguageTool (páginas cortas en espera)
+        try:
+            await asyncio.gather(produce(executor), *(check_languagetool(executor) for _ in range(lt_workers)))
+        finally:
+            for _ in range(workers):
+                await ollama_queue.put(None)
+
+    async def run_stages() -> None:
+        # Un hilo para la extracción y uno por cada lote de LanguageTool en curso
+        with ThreadPoolExecutor(max_workers=1 + lt_workers) as executor, debug_writer or nullcontext():
+            await asyncio.gather(
+                feed_ollama(executor),
+                *(check_ollama() for _ in range(workers)),
+            )
+            await asyncio.gather(*reuse_tasks)
+        if extraction_error is not None:
+            raise PageExtractionError(f"Error extrayendo páginas: {extraction_error}") from extraction_error
+
+    stages = loop.create_task(run_stages())
+    stages.add_done_callback(lambda _: ready_queue.put_nowait(None))
+    try:
+        while True:
+            result = await ready_queue.get()
+            if result is None:
+                break
+            yield result
+        # Propagar los errores de las etapas
+        await stages
+    finally:
+        if not stages.done():
+            stages.cancel()
+            with suppress(asyncio.CancelledError):
+                await stages
+
+
+async def analyze_pages(
+    pages: Iterator[Tuple[int, str]],
+    lt_checker: Checker,
+    ollama_checker,
+    on_page_result: Callable[[int, List[TextError], List[TextError]], None],
+    **options,
+) -> None:
+    """Consume iter_page_results() pasando cada página a on_page_result.
+
+    Args:
+        pages: Iterador de tuplas (número de página 0-indexed, texto)
+        lt_checker: LanguageToolChecker (o LanguageToolPool) ya inicializado; se usa su check_batch()
+        ollama_checker: Instancia de OllamaChecker
+        on_page_result: Callback (página, errores de LanguageTool, errores de
+            Ollama) invocado en orden de página
+        **options: Resto de argumentos de iter_page_results()
+    """
+    async for page_num, lt_errors, ollama_errors in iter_page_results(pages, lt_checker, ollama_checker, **options):
+        on_page_result(page_num, lt_errors, ollama_errors)
+
+
+def run_pipeline(
+    pages: Iterator[Tuple[int, str]],
+    lt_checker: Checker,
+    ollama_checker,
+    on_page_result: Callable[[int, List[TextError], List[TextError]], None],
+    debug_dir: Optional[str] = None,
+    on_page_done: Optional[Callable[[], None]] = None,
+    workers: int = 4,
+    queue_size: int = 4,
+    lt_batch_size: int = 20,
+    lt_workers: int = 1,
+    min_ollama_chars: int = 200,
+    min_alpha_ratio: float = 0.5,
+    min_clean_ollama_chars: int = 500,
+) -> None:
+    """Ejecuta analyze_pages() en un event loop nuevo (punto de entrada síncrono)."""
+    asyncio.run(analyze_pages(
+        pages,
+        lt_checker,
+        ollama_checker,
+        on_page_result,
+        debug_dir=debug_dir,
+        on_page_done=on_page_done,
+        workers=workers,
+        queue_size=queue_size,
+        lt_batch_size=lt_batch_size,
+        lt_workers=lt_workers,
+        min_ollama_chars=min_ollama_chars,
+        min_alpha_ratio=min_alpha_ratio,
+        min_clean_ollama_chars=min_clean_ollama_chars,
+    ))
@@ -1,10 +1,15 @@
 """Utilidades generales: network, debug, y helpers."""
 
+import functools
 import os
-import subprocess
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple, TypeVar
+
+from src.checkers.ollama_pool import get_client
+
+T = TypeVar('T')
 
 try:
     import ollama
@@ -12,61 +17,63 @@ except ImportError:
     ollama = None
 
 
+@functools.lru_cache(maxsize=1)
 def get_windows_host_ip() -> Optional[str]:
     """Obtiene la IP del host Windows desde WSL usando el gateway.
 
+    Lee la ruta por defecto de /proc/net/route (sin lanzar `ip route`). El
+    resultado se memoriza: el gateway no cambia durante la ejecución.
+
     Returns:
         IP del host Windows o None si no se puede determinar.
     """
     try:
-        # Obtener la IP del gateway (host Windows)
-        result = subprocess.run(
-            ['ip', 'route', 'show'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        for line in result.stdout.split('\n'):
-            if 'default via' in line:
-                # Formato: "default via 172.28.240.1 dev eth0 proto kernel"
-                parts = line.split()
-                if len(parts) >= 3:
-                    return parts[2]
-    except Exception:
+        with open('/proc/net/route') as f:
+            next(f)  # Cabecera
+            for line in f:
+                # Formato: "eth0 00000000 01F01CAC 0003 ..." (destino y gateway en hex little-endian)
+                fields = line.split()
+                if len(fields) >= 3 and fields[1] == '00000000' and fields[2] != '00000000':
+                    gateway = fields[2]
+                    return '.'.join(str(int(gateway[i:i + 2], 16)) for i in (6, 4, 2, 0))
+    except (OSError, StopIteration, ValueError):
         pass
     return None
 
 
-def verify_ollama_connection(host: str, timeout: int = 5) -> bool:
+def verify_ollama_connection(host: str, timeout: int = 120) -> Optional["ollama.Client"]:
     """Verifica que Ollama esté accesible y tenga modelos disponibles.
 
+    El cliente usado para la verificación es el mismo que reutiliza
+    OllamaChecker (ver get_client()), así la conexión ya queda abierta.
+
     Args:
         host: URL del servidor Ollama
-        timeout: Timeout en segundos
+        timeout: Timeout en segundos (el de conexión está acotado aparte)
 
     Returns:
-        True si la conexión es exitosa, False en caso contrario
+        Cliente de Ollama si la conexión es exitosa, None en caso contrario
     """
     if ollama is None:
         print("❌ Error: ollama no está instalado.")
-        return False
+        return None
 
     try:
-        client = ollama.Client(host=host, timeout=timeout)
+        client = get_client(host, timeout)
         models = client.list()
 
         if not models or len(models.get('models', [])) == 0:
             print(f"⚠️  Advertencia: Ollama conectado pero no hay modelos instalados")
             print("   Descarga un modelo: ollama pull llama3.2:3b")
-            return False
+            return None
 
-        return True
+        return client
 
     except Exception as e:
         print(f"❌ Error: No se pudo conectar a Ollama en {host}")
         print(f"   Detalle: {str(e)}")
         print("   Revisa CONFIGURACION_OLLAMA.md para solucionar este problema.")
-        return False
+        return None
 
 
 def create_debug_directory(pdf_path: str) -> str:
@@ -98,26 +105,98 @@ def create_debug_directory(pdf_path: str) -> str:
         raise Exception(f"Error creando directorio de debug: {str(e)}")
 
 
-def save_page_text_debug(text: str, page_num: int, debug_dir: str) -> None:
-    """Guarda el texto extraído de una página en un archivo de debug.
+# Cabecera de cada archivo de debug, ya codificada (formato %: página, longitud)
+_DEBUG_HEADER = (
+    "========== PÁGINA %d ==========\n"
+    "Longitud del texto: %d caracteres\n"
+    + "=" * 50 + "\n\n"
+).encode('utf-8')
 
-    Args:
-        text: Texto extraído de la página
-        page_num: Número de página (0-indexed)
-        debug_dir: Directorio donde guardar el archivo
+
+class DebugWriter:
+    """Guarda el texto extraído de cada página en archivos de debug, por lotes.
+
+    Las páginas se acumulan en memoria ya codificadas y se escriben cada
+    flush_every páginas con una sola llamada a os.writev por archivo
+    (cabecera y texto sin concatenarlos antes), en lugar de abrir un archivo
+    con buffer de texto en cada página. El formato de pagina_N.txt no cambia.
+
+    Ejemplo:
+        >>> with DebugWriter(debug_dir) as writer:
+        ...     writer.add(text, page_num=0)
     """
-    # Nombre del archivo (página en formato 1-indexed)
-    filename = f"pagina_{page_num + 1}.txt"
-    filepath = os.path.join(debug_dir, filename)
 
-    try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            # Escribir metadatos
-            f.write(f"========== PÁGINA {page_num + 1} ==========\n")
-            f.write(f"Longitud del texto: {len(text)} caracteres\n")
-            f.write(f"{'=' * 50}\n\n")
-
-            # Escribir el texto extraído
-            f.write(text)
-    except Exception as e:
-        print(f"\n⚠️  Advertencia: No se pudo guardar debug de página {page_num + 1}: {str(e)}")
+    def __init__(self, debug_dir: str, flush_every: int = 32):
+        """Inicializa el escritor.
+
+        Args:
+            debug_dir: Directorio donde guardar los archivos
+            flush_every: Número de páginas acumuladas antes de escribir a disco
+        """
+        self.debug_dir = debug_dir
+        self.flush_every = flush_every
+        self._buf: List[Tuple[bytes, bytes]] = []
+        self._pages: List[int] = []
+
+    def add(self, text: str, page_num: int) -> None:
+        """Añade el texto de una página (se escribe en el siguiente flush).
+
+        Args:
+            text: Texto extraído de la página
+            page_num: Número de página (0-indexed)
+        """
+        self._buf.append((_DEBUG_HEADER % (page_num + 1, len(text)), text.encode('utf-8')))
+        self._pages.append(page_num)
+        if len(self._pages) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Escribe a disco las páginas pendientes."""
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+        for page_num, data in zip(self._pages, self._buf):
+            # Nombre del archivo (página en formato 1-indexed)
+            filepath = os.path.join(self.debug_dir, f"pagina_{page_num + 1}.txt")
+            try:
+                fd = os.open(filepath, flags, 0o644)
+                try:
+                    if hasattr(os, 'writev'):
+                        os.writev(fd, data)
+                    else:
+                        os.write(fd, b"".join(data))
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                print(f"\n⚠️  Advertencia: No se pudo guardar debug de página {page_num + 1}: {str(e)}")
+
+        self._buf.clear()
+        self._pages.clear()
+
+    def close(self) -> None:
+        """Escribe las páginas pendientes."""
+        self.flush()
+
+    def __enter__(self) -> "DebugWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def timed_iter(iterator: Iterator[T], timings: List[float]) -> Iterator[T]:
+    """Envuelve un iterador midiendo el tiempo que tarda en producir cada elemento.
+
+    Args:
+        iterator: Iterador a medir (p. ej. PDFExtractor.iter_pages())
+        timings: Lista donde se añade la duración en segundos de cada elemento
+
+    Yields:
+        Los mismos elementos que el iterador original
+    """
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        timings.append(time.perf_counter() - started)
+        yield item
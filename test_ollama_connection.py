@@ -11,6 +11,9 @@ import argparse
 import sys
 import os
 
+# Misma detección que el analizador: lee el gateway de /proc/net/route (sin lanzar `ip route`)
+from src.utils import get_windows_host_ip
+
 try:
     import ollama
 except ImportError:
@@ -19,28 +22,6 @@ except ImportError:
     sys.exit(1)
 
 
-def get_windows_host_ip():
-    """Obtiene la IP del host Windows desde WSL usando el gateway."""
-    try:
-        import subprocess
-        # Obtener la IP del gateway (host Windows)
-        result = subprocess.run(
-            ['ip', 'route', 'show'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        for line in result.stdout.split('\n'):
-            if 'default via' in line:
-                # Formato: "default via 172.28.240.1 dev eth0 proto kernel"
-                parts = line.split()
-                if len(parts) >= 3:
-                    return parts[2]
-    except Exception:
-        pass
-    return None
-
-
 def test_connection(host: str, timeout: int = 5):
     """
     Prueba la conexión a Ollama.